@@ -5,11 +5,22 @@ IEEE Cookie API Server - Serves fresh cookie to Next.js app
 Run this on your VPS to provide cookie API endpoint.
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+import json
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+from ieee_validator import IEEEMembershipValidator
+from member_ids import normalize_member_id
+from rate_limiter import RateLimitExceeded, SharedRateLimiter
+from result_cache import DEFAULT_CACHE_FILE, DEFAULT_NEGATIVE_TTL, DEFAULT_TTL, SQLiteResultCache
+from ttl_policy import TTLPolicy
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Next.js app
@@ -24,19 +35,209 @@ logger = logging.getLogger(__name__)
 COOKIE_FILE = os.path.join(os.path.dirname(__file__), 'ieee_cookie.txt')
 API_KEY = os.getenv('API_KEY', '')  # Optional API key for security
 
+# Local result cache shared with the CLI and the web app
+result_cache = SQLiteResultCache(
+    os.getenv('RESULT_CACHE_FILE', DEFAULT_CACHE_FILE),
+    ttl=int(os.getenv('RESULT_CACHE_TTL', DEFAULT_TTL)),
+    policy=TTLPolicy.from_env(),
+    negative_ttl=int(os.getenv('NEGATIVE_RESULT_TTL', DEFAULT_NEGATIVE_TTL))
+)
 
-def read_cookie():
-    """Read cookie from file."""
-    try:
-        if os.path.exists(COOKIE_FILE):
-            with open(COOKIE_FILE, 'r') as f:
+# Minimum seconds between stat() calls on the cookie file
+COOKIE_CHECK_INTERVAL = float(os.getenv('COOKIE_CHECK_INTERVAL', 1.0))
+
+# Batch endpoint limits
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', 50))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 3))
+
+# Upstream pacing shared by all gunicorn workers on this host
+UPSTREAM_INTERVAL = float(os.getenv('UPSTREAM_INTERVAL', 0.7))
+UPSTREAM_BURST = int(os.getenv('UPSTREAM_BURST', 3))
+UPSTREAM_MAX_WAIT = float(os.getenv('UPSTREAM_MAX_WAIT', 10))
+upstream_limiter = SharedRateLimiter(
+    os.getenv('UPSTREAM_RATE_FILE', os.path.join(os.path.dirname(__file__), 'upstream_rate.state')),
+    UPSTREAM_INTERVAL,
+    burst=UPSTREAM_BURST
+)
+
+# Keep-alive connections to IEEE kept per process (size to gunicorn --threads)
+VALIDATOR_POOL_SIZE = int(os.getenv('VALIDATOR_POOL_SIZE', 10))
+
+
+class ValidatorPool:
+    """
+    Process-wide validator shared by all request threads.
+    
+    Its session keeps keep-alive connections to services24.ieee.org open
+    across requests, so single checks skip the TCP+TLS handshake. The
+    cookie is swapped in place only when it changes.
+    """
+    
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._validator = None
+        self._cookie_version = None
+    
+    def get(self, cookie: str, version: int) -> IEEEMembershipValidator:
+        """Return the shared validator, updated to cookie `version`."""
+        with self._lock:
+            if self._validator is None:
+                validator = IEEEMembershipValidator(cookie, result_cache=result_cache)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                validator.session.mount('https://', adapter)
+                self._validator = validator
+                self._cookie_version = version
+                logger.info(f"Validator session created (cookie v{version})")
+            elif version > self._cookie_version:
+                # Only move forward: a thread that read an older version
+                # must not put the old cookie back
+                self._validator.set_cookie(cookie)
+                self._cookie_version = version
+                logger.info(f"Validator session updated to cookie v{version}")
+            return self._validator
+
+
+validator_pool = ValidatorPool(VALIDATOR_POOL_SIZE)
+
+
+class _Flight:
+    """One in-flight call and the callers waiting on it."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+    
+    The first caller runs the function; callers arriving while it is in
+    flight wait for it and receive the same result (or exception).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+    
+    def do(self, key, fn):
+        """Run `fn()` once for all concurrent callers with the same key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fn()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+
+# Concurrent lookups of one member share a single IEEE request
+lookups = SingleFlight()
+
+
+def paced_lookup(validator, member_id):
+    """Wait for an upstream slot (bounded), then validate the member."""
+    upstream_limiter.acquire(UPSTREAM_MAX_WAIT)
+    return validator.validate_member(member_id)
+
+
+class CookieHolder:
+    """
+    In-memory copy of the cookie file.
+    
+    The file is stat()ed at most once per `check_interval` and only re-read
+    when its mtime or size changes. Every change of the loaded cookie bumps
+    `version`, which the validator pool uses to swap its session cookie.
+    """
+    
+    def __init__(self, path: str, check_interval: float):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = None
+        # (cookie, version, file_size, file_modified) swapped as one tuple
+        self._state = (None, 0, None, None)
+    
+    def _load(self):
+        """Read and validate the cookie file."""
+        try:
+            with open(self.path, 'r') as f:
                 cookie = f.read().strip()
-            if cookie and len(cookie) > 50:  # Basic validation
-                return cookie
-        return None
-    except Exception as e:
-        logger.error(f"Error reading cookie: {e}")
+        except Exception as e:
+            logger.error(f"Error reading cookie: {e}")
+            return None
+        if cookie and len(cookie) > 50:  # Basic validation
+            return cookie
         return None
+    
+    def _refresh(self):
+        """Reload the cookie if the file changed since the last check."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except OSError:
+                stat = signature = None
+            if signature == self._signature:
+                return
+            self._signature = signature
+            
+            cookie, version = self._state[:2]
+            new_cookie = self._load() if stat else None
+            if new_cookie != cookie:
+                version += 1
+                logger.info(f"Cookie file changed, loaded cookie v{version}" if new_cookie
+                            else "Cookie file missing or invalid")
+            self._state = (
+                new_cookie,
+                version,
+                stat.st_size if stat else None,
+                datetime.fromtimestamp(stat.st_mtime) if stat else None
+            )
+    
+    def get(self):
+        """Return (cookie or None, version)."""
+        self._refresh()
+        cookie, version = self._state[:2]
+        return cookie, version
+    
+    def file_info(self):
+        """Return (file_size, file_modified) from the last check, or (None, None)."""
+        self._refresh()
+        return self._state[2:]
+
+
+cookie_holder = CookieHolder(COOKIE_FILE, COOKIE_CHECK_INTERVAL)
+
+
+def read_cookie():
+    """Return the current cookie, or None if unavailable."""
+    return cookie_holder.get()[0]
 
 
 def check_auth():
@@ -56,10 +257,11 @@ def check_auth():
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    cookie_available = read_cookie() is not None
+    cookie, version = cookie_holder.get()
     return jsonify({
         'status': 'ok',
-        'cookie_available': cookie_available,
+        'cookie_available': cookie is not None,
+        'cookie_version': version,
         'timestamp': datetime.utcnow().isoformat()
     })
 
@@ -70,7 +272,7 @@ def get_cookie():
     if not check_auth():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    cookie = read_cookie()
+    cookie, version = cookie_holder.get()
     
     if not cookie:
         logger.warning("Cookie not available - refresh may be needed")
@@ -82,10 +284,47 @@ def get_cookie():
     logger.info("Cookie requested and served successfully")
     return jsonify({
         'cookie': cookie,
+        'version': version,
         'timestamp': datetime.utcnow().isoformat()
     })
 
 
+def member_payload(result, member_id):
+    """Convert a validator result to the API's JSON member object."""
+    if result['error']:
+        return {
+            'isValid': False,
+            'error': result['error'],
+            'membershipStatus': result['membership_status'] or 'Unknown',
+            'memberId': member_id
+        }
+    
+    return {
+        'isValid': result['membership_status'] and 'Active' in result['membership_status'],
+        'membershipStatus': result['membership_status'] or 'Unknown',
+        'nameInitials': result['name_initials'],
+        'memberGrade': result['member_grade'],
+        'standardsAssociationMember': result['standards_association_member'],
+        'societyMemberships': result['society_memberships'],
+        'memberId': member_id
+    }
+
+
+def format_result(result, member_id):
+    """Convert a validator result to the API response format."""
+    status = 503 if result['error'] and 'Session expired' in result['error'] else 200
+    return jsonify(member_payload(result, member_id)), status
+
+
+def cached_result(member_id):
+    """Return the cached result for a member, or None (also if the cache fails)."""
+    try:
+        return result_cache.get(member_id)
+    except Exception as e:
+        logger.warning(f"Result cache unavailable: {e}")
+        return None
+
+
 @app.route('/api/validate-member', methods=['POST'])
 def validate_member():
     """Validate an IEEE member number."""
@@ -96,11 +335,18 @@ def validate_member():
     if not data or 'memberId' not in data:
         return jsonify({'error': 'memberId is required'}), 400
     
-    member_id = data['memberId'].strip()
-    if not member_id:
-        return jsonify({'error': 'memberId cannot be empty'}), 400
+    # Canonicalize and reject malformed IDs before any upstream call; the
+    # answer is an invalid member, in the same shape as the batch endpoint
+    member_id, id_error = normalize_member_id(data['memberId'])
+    if id_error:
+        return jsonify({'isValid': False, 'error': id_error, 'memberId': data['memberId']})
     
-    cookie = read_cookie()
+    # Cached results are served without touching the cookie or IEEE
+    cached = cached_result(member_id)
+    if cached:
+        return format_result(cached, member_id)
+    
+    cookie, version = cookie_holder.get()
     if not cookie:
         return jsonify({
             'error': 'Cookie not available',
@@ -108,63 +354,135 @@ def validate_member():
         }), 503
     
     try:
-        # Import the validator class
-        import sys
-        import os
-        validator_dir = os.path.dirname(os.path.abspath(__file__))
-        sys.path.insert(0, validator_dir)
-        
-        from ieee_validator import IEEEMembershipValidator
+        validator = validator_pool.get(cookie, version)
+        result = lookups.do(member_id, lambda: paced_lookup(validator, member_id))
         
-        validator = IEEEMembershipValidator(cookie)
-        result = validator.validate_member(member_id)
-        
-        # Convert to our API format
-        if result['error']:
-            return jsonify({
-                'isValid': False,
-                'error': result['error'],
-                'membershipStatus': result['membership_status'] or 'Unknown',
-                'memberId': member_id
-            }), 200 if 'Session expired' not in result['error'] else 503
+        return format_result(result, member_id)
         
+    except RateLimitExceeded as e:
+        logger.warning(f"Upstream budget exhausted: {e}")
         return jsonify({
-            'isValid': result['membership_status'] and 'Active' in result['membership_status'],
-            'membershipStatus': result['membership_status'] or 'Unknown',
-            'nameInitials': result['name_initials'],
-            'memberGrade': result['member_grade'],
-            'standardsAssociationMember': result['standards_association_member'],
-            'societyMemberships': result['society_memberships'],
-            'memberId': member_id
-        })
+            'error': 'Too many requests',
+            'message': 'IEEE lookups are rate limited, please retry shortly',
+            'retryAfter': e.retry_after
+        }), 429, {'Retry-After': str(e.retry_after)}
         
-    except ImportError as e:
-        logger.error(f"Failed to import validator: {e}")
-        return jsonify({'error': 'Validation service configuration error'}), 500
     except Exception as e:
         logger.error(f"Validation error: {e}")
         return jsonify({'error': f'Validation failed: {str(e)}'}), 500
 
 
+@app.route('/api/validate-members', methods=['POST'])
+def validate_members():
+    """
+    Validate a list of IEEE member numbers.
+    
+    Streams one NDJSON line per submitted entry as soon as its result is
+    ready: malformed and cached members first, then upstream lookups in
+    completion order over the pooled session. Repeats of a member share one
+    lookup, and every line echoes the submitted value as `input`.
+    """
+    data = request.get_json(silent=True)
+    member_ids = data.get('memberIds') if isinstance(data, dict) else None
+    if not isinstance(member_ids, list) or not member_ids:
+        return jsonify({'error': 'memberIds must be a non-empty list'}), 400
+    if len(member_ids) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} memberIds per request'}), 400
+    
+    ready = []
+    # Canonical ID -> submitted values, in first-seen order
+    to_fetch = {}
+    for raw in member_ids:
+        member_id, id_error = normalize_member_id(raw)
+        if id_error:
+            ready.append({'isValid': False, 'error': id_error, 'memberId': raw, 'input': raw})
+            continue
+        if member_id in to_fetch:
+            to_fetch[member_id].append(raw)
+            continue
+        cached = cached_result(member_id)
+        if cached:
+            ready.append({**member_payload(cached, member_id), 'input': raw})
+        else:
+            to_fetch[member_id] = [raw]
+    
+    cookie, version = cookie_holder.get()
+    
+    def generate():
+        for payload in ready:
+            yield json.dumps(payload) + '\n'
+        if not to_fetch:
+            return
+        
+        if not cookie:
+            for member_id, inputs in to_fetch.items():
+                for raw in inputs:
+                    yield json.dumps({
+                        'isValid': False,
+                        'error': 'Cookie not available',
+                        'memberId': member_id,
+                        'input': raw
+                    }) + '\n'
+            return
+        
+        validator = validator_pool.get(cookie, version)
+        executor = ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(to_fetch)))
+        futures = {
+            executor.submit(lookups.do, member_id, lambda m=member_id: paced_lookup(validator, m)): member_id
+            for member_id in to_fetch
+        }
+        try:
+            for future in as_completed(futures):
+                member_id = futures[future]
+                try:
+                    payload = member_payload(future.result(), member_id)
+                except RateLimitExceeded as e:
+                    payload = {
+                        'isValid': False,
+                        'error': 'Too many requests',
+                        'retryAfter': e.retry_after,
+                        'memberId': member_id
+                    }
+                except Exception as e:
+                    logger.error(f"Validation error: {e}")
+                    payload = {
+                        'isValid': False,
+                        'error': f'Validation failed: {str(e)}',
+                        'memberId': member_id
+                    }
+                for raw in to_fetch[member_id]:
+                    yield json.dumps({**payload, 'input': raw}) + '\n'
+        finally:
+            # A disconnected client cancels lookups that have not started
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    return Response(generate(), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # stop nginx from buffering the stream
+    })
+
+
 @app.route('/api/cookie/status', methods=['GET'])
 def cookie_status():
     """Get cookie status information."""
     # Status endpoint doesn't require auth (useful for monitoring)
     
-    cookie = read_cookie()
-    file_exists = os.path.exists(COOKIE_FILE)
+    cookie, version = cookie_holder.get()
+    file_size, file_modified = cookie_holder.file_info()
+    file_exists = file_size is not None
     
     stats = {
         'available': cookie is not None,
+        'version': version,
         'file_exists': file_exists,
         'timestamp': datetime.utcnow().isoformat()
     }
     
     if file_exists:
-        stats['file_size'] = os.path.getsize(COOKIE_FILE)
-        stats['file_modified'] = datetime.fromtimestamp(
-            os.path.getmtime(COOKIE_FILE)
-        ).isoformat()
+        stats['file_size'] = file_size
+        stats['file_modified'] = file_modified.isoformat()
     
     return jsonify(stats)
 
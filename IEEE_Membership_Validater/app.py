@@ -5,15 +5,35 @@ IEEE Membership Validator Web Application
 A Flask web interface for bulk validating IEEE memberships.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from ieee_validator import IEEEMembershipValidator
-import pandas as pd
-import io
+from rate_limiter import StartRateLimiter
+from result_cache import SQLiteResultCache
+from ttl_policy import TTLPolicy
+from result_journal import iter_csv, iter_jsonl, write_xlsx
+from validation_jobs import JobStore
+from concurrent.futures import ThreadPoolExecutor
+import json
+import tempfile
 import time
-from typing import List, Dict
 
 app = Flask(__name__)
 
+# Results shared with the CLI and the API server
+result_cache = SQLiteResultCache(policy=TTLPolicy.from_env())
+
+# Validations run in the background; at most this many at once
+MAX_RUNNING_JOBS = 2
+jobs = JobStore()
+job_executor = ThreadPoolExecutor(max_workers=MAX_RUNNING_JOBS)
+
+# One IEEE request start every 0.7s across all running jobs
+REQUEST_DELAY = 0.7
+upstream_limiter = StartRateLimiter(REQUEST_DELAY)
+
+# Seconds between progress frames on the /events stream
+PROGRESS_INTERVAL = 1.0
+
 
 @app.route('/')
 def index():
@@ -23,7 +43,7 @@ def index():
 
 @app.route('/validate', methods=['POST'])
 def validate():
-    """Validate IEEE membership numbers."""
+    """Start validating IEEE membership numbers and return a job ID."""
     try:
         # Get form data
         cookie = request.form.get('cookie', '').strip()
@@ -46,66 +66,128 @@ def validate():
         if not membership_ids:
             return jsonify({'error': 'No valid membership IDs found'}), 400
         
-        # Initialize validator
-        validator = IEEEMembershipValidator(cookie)
-        
-        # Validate each member
-        results = []
-        total = len(membership_ids)
-        
-        for idx, member_id in enumerate(membership_ids):
-            result = validator.validate_member(member_id)
-            results.append(result)
-            
-            # Add delay between requests (except for the last one)
-            if idx < total - 1:
-                time.sleep(validator.delay)
-        
-        # Convert to DataFrame for Excel export
-        df = pd.DataFrame(results)
+        # The cookie comes from the caller, so an expiry fails the job instead
+        # of falling back to the server's own cookie (ieee_cookie.txt / .env)
+        validator = IEEEMembershipValidator(cookie, result_cache=result_cache)
         
-        # Create Excel file in memory
-        output = io.BytesIO()
-        df.to_excel(output, index=False, engine='openpyxl')
-        output.seek(0)
+        # Validate in the background and hand back a job ID right away
+        job = jobs.create(membership_ids)
+        job_executor.submit(job.run, validator, upstream_limiter)
         
-        # Return results as JSON and Excel file
         return jsonify({
             'success': True,
-            'total': total,
-            'results': results,
-            'excel_data': output.getvalue().hex()  # Send as hex for JSON
-        })
+            'job_id': job.id,
+            'total': job.total,
+            'status_url': f'/status/{job.id}',
+            'events_url': f'/events/{job.id}',
+            'download_url': f'/download/{job.id}'
+        }), 202
         
     except Exception as e:
         return jsonify({'error': f'Validation error: {str(e)}'}), 500
 
 
-@app.route('/download', methods=['POST'])
-def download():
-    """Download results as Excel file."""
+@app.route('/status/<job_id>', methods=['GET'])
+def status(job_id):
+    """Report job progress and the results completed so far."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    # Pollers pass ?since=<results already received> to fetch only new rows
+    since = request.args.get('since', 0, type=int)
+    progress = job.progress()
+    progress['results'] = job.results_since(since)
+    return jsonify(progress)
+
+
+def sse_frame(event, data, event_id=None):
+    """Format one Server-Sent Events frame."""
+    frame = f'event: {event}\n'
+    if event_id is not None:
+        frame += f'id: {event_id}\n'
+    return frame + f'data: {json.dumps(data)}\n\n'
+
+
+@app.route('/events/<job_id>', methods=['GET'])
+def events(job_id):
+    """
+    Stream job progress as Server-Sent Events.
+    
+    Sends a `result` event per member as soon as it is validated, a
+    `progress` event (throughput, ETA) at least every PROGRESS_INTERVAL
+    seconds, and a final `done` event. Reconnecting clients resume after
+    the Last-Event-ID they received.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    # Event IDs are result positions, so a reconnect skips what was sent
+    offset = request.headers.get('Last-Event-ID', type=int)
+    if offset is None:
+        offset = request.args.get('since', 0, type=int)
+    
+    def generate():
+        sent = offset
+        last_progress = 0.0
+        while True:
+            finished = job.finished
+            new_results = job.wait_for_results(sent, PROGRESS_INTERVAL)
+            for result in new_results:
+                sent += 1
+                yield sse_frame('result', {'index': sent - 1, 'result': result}, event_id=sent)
+            
+            if finished:
+                yield sse_frame('done', job.progress())
+                return
+            if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                yield sse_frame('progress', job.progress())
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # stop nginx from buffering the stream
+    })
+
+
+# Download formats: (mimetype, file extension)
+DOWNLOAD_FORMATS = {
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl')
+}
+
+
+@app.route('/download/<job_id>', methods=['GET'])
+def download(job_id):
+    """Download a job's results as an xlsx, csv or jsonl attachment."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    file_format = request.args.get('format', 'xlsx').lower()
+    if file_format not in DOWNLOAD_FORMATS:
+        return jsonify({'error': f"Unsupported format '{file_format}'. Use xlsx, csv or jsonl"}), 400
+    
     try:
-        # Get results from request
-        results = request.json.get('results', [])
-        
-        if not results:
-            return jsonify({'error': 'No results to download'}), 400
-        
-        # Create DataFrame
-        df = pd.DataFrame(results)
-        
-        # Create Excel file in memory
-        output = io.BytesIO()
-        df.to_excel(output, index=False, engine='openpyxl')
-        output.seek(0)
-        
-        # Return as downloadable file
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name='ieee_validation_results.xlsx'
-        )
+        # Results completed so far (a running job downloads what it has)
+        results = job.results_since(0)
+        mimetype, extension = DOWNLOAD_FORMATS[file_format]
+        download_name = f'ieee_validation_results_{job.id[:8]}.{extension}'
+        
+        if file_format == 'xlsx':
+            # Zip-based, so it is built on disk and then streamed from there
+            output = tempfile.TemporaryFile()
+            write_xlsx(results, output)
+            output.seek(0)
+            return send_file(output, mimetype=mimetype, as_attachment=True,
+                             download_name=download_name)
+        
+        rows = iter_csv(results) if file_format == 'csv' else iter_jsonl(results)
+        return Response(rows, mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename={download_name}'
+        })
         
     except Exception as e:
         return jsonify({'error': f'Download error: {str(e)}'}), 500
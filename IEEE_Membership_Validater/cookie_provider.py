@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Cookie providers for swapping a fresh PA.Global_Websession cookie into a
+running validator when the current one expires.
+"""
+
+import os
+import subprocess
+import sys
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COOKIE_NAME = 'PA.Global_Websession'
+# Written by ieee_login.py and read by the CLI, wherever they are run from
+COOKIE_FILE = os.path.join(BASE_DIR, 'ieee_cookie.txt')
+
+
+def clean_cookie(value: Optional[str]) -> Optional[str]:
+    """Strip whitespace, quotes and a leading 'PA.Global_Websession=' prefix."""
+    if not value:
+        return None
+    value = value.strip().strip('"\'')
+    if value.startswith(f'{COOKIE_NAME}='):
+        value = value.split('=', 1)[1]
+    return value or None
+
+
+class CookieProvider(ABC):
+    """Base class: returns the best cookie currently available."""
+
+    name = 'cookie'
+
+    @abstractmethod
+    def get_cookie(self, stale: Optional[str] = None) -> Optional[str]:
+        """
+        Return a cookie value, or None if this source has none.
+
+        Args:
+            stale: The cookie that just expired; chains use it to move on to
+                the next source when one still holds the old value
+        """
+
+
+class FileCookieProvider(CookieProvider):
+    """Reads the cookie file written by ieee_login.py."""
+
+    name = 'file'
+
+    def __init__(self, path: str = COOKIE_FILE):
+        self.path = path
+
+    def get_cookie(self, stale: Optional[str] = None) -> Optional[str]:
+        try:
+            with open(self.path, 'r') as f:
+                return clean_cookie(f.read())
+        except OSError:
+            return None
+
+
+class EnvCookieProvider(CookieProvider):
+    """Reads IEEE_COOKIE from the process environment or a .env file."""
+
+    name = 'env'
+
+    def __init__(self, env_file: str = os.path.join(BASE_DIR, '.env'), variable: str = 'IEEE_COOKIE'):
+        self.env_file = env_file
+        self.variable = variable
+
+    def get_cookie(self, stale: Optional[str] = None) -> Optional[str]:
+        # The .env file is re-read each time so rotated cookies are picked up
+        try:
+            with open(self.env_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith(f'{self.variable}='):
+                        return clean_cookie(line.split('=', 1)[1])
+        except OSError:
+            pass
+        return clean_cookie(os.getenv(self.variable))
+
+
+class LoginCookieProvider(CookieProvider):
+    """Runs ieee_login.py to log in again, then reads the cookie it saved."""
+
+    name = 'login'
+
+    def __init__(self, script: str = os.path.join(BASE_DIR, 'ieee_login.py'), timeout: int = 300):
+        self.script = script
+        self.timeout = timeout
+        self.cookie_file = FileCookieProvider(os.path.join(os.path.dirname(script), 'ieee_cookie.txt'))
+
+    def get_cookie(self, stale: Optional[str] = None) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                [sys.executable, self.script],
+                # No terminal to answer a credentials prompt; fail instead of hanging
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+                cwd=os.path.dirname(self.script)
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        if result.returncode != 0:
+            return None
+        return self.cookie_file.get_cookie()
+
+
+class ChainCookieProvider(CookieProvider):
+    """Tries providers in order and returns the first cookie that differs from `stale`."""
+
+    name = 'chain'
+
+    def __init__(self, providers: List[CookieProvider]):
+        self.providers = providers
+        self.last_source: Optional[str] = None
+
+    def get_cookie(self, stale: Optional[str] = None) -> Optional[str]:
+        for provider in self.providers:
+            cookie = provider.get_cookie(stale)
+            if cookie and cookie != stale:
+                self.last_source = provider.name
+                return cookie
+        return None
+
+
+def default_cookie_provider(allow_login: bool = False) -> ChainCookieProvider:
+    """
+    Build the standard provider chain: ieee_cookie.txt, then .env/IEEE_COOKIE,
+    then (optionally) a fresh Playwright login.
+    """
+    providers: List[CookieProvider] = [FileCookieProvider(), EnvCookieProvider()]
+    if allow_login:
+        providers.append(LoginCookieProvider())
+    return ChainCookieProvider(providers)
@@ -13,7 +13,7 @@ import sys
 import os
 
 IEEE_LOGIN_URL = "https://www.ieee.org/profile/public/createwebaccount/showSignIn.html"
-COOKIE_FILE = "ieee_cookie.txt"
+COOKIE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ieee_cookie.txt")
 
 def login_and_get_cookie(username: str, password: str):
     """
@@ -7,23 +7,53 @@ against the IEEE membership validator service, and writes results to an output f
 """
 
 import time
+import codecs
+import threading
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from typing import Dict, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Union
 import sys
 import os
 
+from cookie_provider import COOKIE_FILE, CookieProvider, default_cookie_provider
+from member_ids import normalize_member_id
+from membership_parser import DEFAULT_PARSER, MembershipExtractor, MembershipStreamWatcher
+from rate_limiter import StartRateLimiter
+from result_cache import DEFAULT_CACHE_FILE, DEFAULT_TTL, ResultCache, SQLiteResultCache
+from result_journal import ResultJournal, export_results
+from roster_reader import RosterReader
+from ttl_policy import DEFAULT_JITTER, DEFAULT_RULES, TTLPolicy
+
+# Finished lookups remembered per bulk run so repeated IDs are answered
+# without the cache or IEEE; bounded so memory stays flat for huge rosters
+RECENT_RESULTS = 10000
+
+
+def is_session_error(result: Dict[str, Optional[str]]) -> bool:
+    """Return True if a result failed because the cookie expired or was rejected."""
+    error = result.get('error') or ''
+    return 'Session expired' in error or 'Authentication failed' in error
+
 
 class IEEEMembershipValidator:
     """Handles bulk validation of IEEE memberships."""
     
-    def __init__(self, cookie: str):
+    def __init__(self, cookie: str, parser: str = DEFAULT_PARSER, stream: bool = False,
+                 cookie_provider: Optional[CookieProvider] = None,
+                 result_cache: Optional[ResultCache] = None):
         """
         Initialize the validator with authentication cookie.
         
         Args:
             cookie: PA.Global_Websession cookie value
+            parser: BeautifulSoup tree builder (defaults to lxml when installed)
+            stream: Read responses incrementally and stop once the membership
+                block has been received
+            cookie_provider: Source of fresh cookies when the session expires
+                during bulk validation (None to stop on expiry)
+            result_cache: Cache consulted before, and filled after, each
+                upstream lookup (None to always ask IEEE)
         """
         self.base_url = "https://services24.ieee.org/membership-validator.html"
         self.session = requests.Session()
@@ -39,24 +69,146 @@ class IEEEMembershipValidator:
         })
         
         # Set authentication cookie
-        self.session.cookies.set('PA.Global_Websession', cookie, domain='services24.ieee.org')
+        self.cookie = None
+        self.set_cookie(cookie)
+        
+        # Hot cookie swap: provider, how long to wait for a new cookie, and a
+        # lock that pauses new requests while a swap is in progress
+        self.cookie_provider = cookie_provider
+        self.cookie_wait = 0
+        self._cookie_lock = threading.Lock()
         
-        # Delay between requests (seconds)
+        # Delay between request starts (seconds)
         self.delay = 0.7
+        
+        # Requests allowed in flight at once during bulk validation
+        self.concurrency = 3
+        
+        # Single-pass page parser shared with the worker
+        self.extractor = MembershipExtractor(parser)
+        
+        # Local cache of successful results
+        self.result_cache = result_cache
+        
+        # Streaming download settings
+        self.stream = stream
+        self.stream_chunk_size = 8192
+    
+    def set_cookie(self, cookie: str):
+        """
+        Replace the authentication cookie in the session's cookie jar.
+        
+        The session (and its keep-alive connections) is kept. Setting the
+        same name and domain replaces the value in place, so requests on
+        other threads never see a jar without the cookie.
+        
+        Args:
+            cookie: PA.Global_Websession cookie value
+        """
+        self.session.cookies.set('PA.Global_Websession', cookie, domain='services24.ieee.org')
+        self.cookie = cookie
+    
+    def refresh_cookie(self, stale: str) -> bool:
+        """
+        Swap a fresh cookie from the cookie provider into the session.
+        
+        Polls the provider for up to `self.cookie_wait` seconds. New requests
+        from validate_many wait while this runs.
+        
+        Args:
+            stale: The cookie that was rejected
+            
+        Returns:
+            True if the session now holds a different cookie
+        """
+        with self._cookie_lock:
+            if self.cookie != stale:
+                return True  # Another thread already swapped it
+            if not self.cookie_provider:
+                return False
+            
+            deadline = time.monotonic() + self.cookie_wait
+            while True:
+                cookie = self.cookie_provider.get_cookie(stale)
+                if cookie and cookie != stale:
+                    self.set_cookie(cookie)
+                    source = getattr(self.cookie_provider, 'last_source', None) or 'provider'
+                    print(f"\n🔄 Session expired - swapped in a fresh cookie from {source}")
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(5, remaining))
+    
+    def _cached_result(self, member_number: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return a cached result for a canonical member ID, if any."""
+        if self.result_cache is None:
+            return None
+        try:
+            return self.result_cache.get(member_number)
+        except Exception:
+            # A broken cache must never block validation
+            return None
     
-    def _check_session_expiry(self, soup: BeautifulSoup) -> bool:
+    def _store_result(self, member_number: str, result: Dict[str, Optional[str]]):
+        """Cache a successful result; failures (e.g. a locked database) are ignored."""
+        if self.result_cache is None:
+            return
+        try:
+            self.result_cache.set(member_number, result)
+        except Exception:
+            # The lookup succeeded; losing the cache entry only costs a re-query
+            pass
+    
+    def _error_result(self, member_number: str, error: str) -> Dict[str, Optional[str]]:
+        """Build a result row for a member that could not be validated."""
+        return {
+            'ieee_number': member_number,
+            'name_initials': None,
+            'membership_status': None,
+            'member_grade': None,
+            'standards_association_member': None,
+            'society_memberships': None,
+            'error': error
+        }
+    
+    def _fetch_page(self, form_data: Dict[str, str]):
         """
-        Check if session has expired by looking for 'Membership validation status' section.
+        POST the lookup form and return the response with its HTML.
+        
+        In streaming mode the body is read in chunks and the connection is
+        closed as soon as the membership block is complete or the page is a
+        sign-in form, so site chrome and footers are never downloaded.
         
         Args:
-            soup: BeautifulSoup object of the HTML response
+            form_data: Form fields for the validator page
             
         Returns:
-            True if session expired (status section missing), False otherwise
+            Tuple of (response, html text read)
         """
-        # Look for "Membership validation status" text in the HTML
-        status_section = soup.find(string=lambda text: text and 'Membership validation status' in text)
-        return status_section is None
+        if not self.stream:
+            response = self.session.post(self.base_url, data=form_data, timeout=30)
+            response.raise_for_status()
+            return response, response.text
+        
+        response = self.session.post(self.base_url, data=form_data, timeout=30, stream=True)
+        try:
+            response.raise_for_status()
+            watcher = MembershipStreamWatcher()
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+            chunks = []
+            for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+                text = decoder.decode(chunk)
+                chunks.append(text)
+                watcher.feed(text)
+                if watcher.done:
+                    break
+            else:
+                chunks.append(decoder.decode(b'', final=True))
+            return response, ''.join(chunks)
+        finally:
+            # Releases the connection; an early stop discards the rest of the body
+            response.close()
     
     def validate_member(self, member_number: str) -> Dict[str, Optional[str]]:
         """
@@ -68,260 +220,228 @@ class IEEEMembershipValidator:
         Returns:
             Dictionary containing validation results
         """
+        canonical, error = normalize_member_id(member_number)
+        if error:
+            return self._error_result(str(member_number), error)
+        member_number = canonical
+        
+        cached = self._cached_result(member_number)
+        if cached:
+            return cached
+        
         # Prepare form data
         form_data = {
-            'customerId': str(member_number).strip()
+            'customerId': member_number
         }
         
         try:
             # Send POST request
-            response = self.session.post(
-                self.base_url,
-                data=form_data,
-                timeout=30
-            )
-            response.raise_for_status()
+            response, html = self._fetch_page(form_data)
             
             # Parse HTML response
-            soup = BeautifulSoup(response.text, 'html.parser')
+            page = self.extractor.parse(html)
             
             # Check for session expiry or authentication failure
-            if self._check_session_expiry(soup):
+            # ('Membership validation status' section missing)
+            if not page['status_section_found']:
                 error_msg = 'Session expired: Membership validation status section not found'
                 # Check for 401/403 indicators
-                if response.status_code == 401 or 'unauthorized' in response.text.lower():
+                if response.status_code == 401 or 'unauthorized' in html.lower():
                     error_msg = 'Authentication failed: Cookie expired or invalid (401)'
-                elif 'sign in' in response.text.lower() or 'login' in response.text.lower():
+                elif 'sign in' in html.lower() or 'login' in html.lower():
                     error_msg = 'Session expired: Please refresh cookie'
-                return {
-                    'ieee_number': member_number,
-                    'name_initials': None,
-                    'membership_status': None,
-                    'member_grade': None,
-                    'standards_association_member': None,
-                    'society_memberships': None,
-                    'error': error_msg
-                }
+                return self._error_result(member_number, error_msg)
             
-            # Extract fields using robust selectors
+            # Fields extracted in a single pass over the page
             result = {
                 'ieee_number': member_number,
-                'name_initials': self._extract_name_initials(soup),
-                'membership_status': self._extract_membership_status(soup),
-                'member_grade': self._extract_member_grade(soup),
-                'standards_association_member': self._extract_standards_association(soup),
-                'society_memberships': self._extract_society_memberships(soup),
+                'name_initials': page['name_initials'],
+                'membership_status': page['membership_status'],
+                'member_grade': page['member_grade'],
+                'standards_association_member': page['standards_association_member'],
+                'society_memberships': page['society_memberships'],
                 'error': None
             }
             
+            self._store_result(member_number, result)
+            
             return result
             
         except requests.exceptions.RequestException as e:
-            return {
-                'ieee_number': member_number,
-                'name_initials': None,
-                'membership_status': None,
-                'member_grade': None,
-                'standards_association_member': None,
-                'society_memberships': None,
-                'error': f'Request error: {str(e)}'
-            }
+            return self._error_result(member_number, f'Request error: {str(e)}')
         except Exception as e:
-            return {
-                'ieee_number': member_number,
-                'name_initials': None,
-                'membership_status': None,
-                'member_grade': None,
-                'standards_association_member': None,
-                'society_memberships': None,
-                'error': f'Parsing error: {str(e)}'
-            }
+            return self._error_result(member_number, f'Parsing error: {str(e)}')
     
-    def _extract_field_value(self, soup: BeautifulSoup, label_text: str) -> Optional[str]:
+    def validate_many(self, member_numbers: Iterable[str],
+                      concurrency: Optional[int] = None,
+                      limiter: Optional[StartRateLimiter] = None) -> Iterator[Dict[str, Optional[str]]]:
         """
-        Generic method to extract a field value by its label text.
+        Validate members with overlapping requests, yielding results in input order.
+        
+        IDs are normalized first: malformed values get an error result without
+        a network call, cached members are answered locally, and duplicates
+        share a single upstream lookup whose result is repeated for every
+        occurrence. Finished results are remembered for the last
+        RECENT_RESULTS unique IDs, so memory stays flat for large rosters.
+        
+        Request starts are spaced at least `self.delay` apart, so up to
+        `concurrency` lookups overlap without raising the request rate.
+        Runs that happen at the same time must pass one shared `limiter` to
+        keep that rate overall.
+        When the session expires, the cookie provider is asked for a fresh
+        cookie and the member is retried once; if none is available, the
+        remaining members fail fast without further upstream requests.
+        Closing the iterator early cancels lookups that have not started.
         
         Args:
-            soup: BeautifulSoup object
-            label_text: The label text to search for (e.g., "First and last name initials")
+            member_numbers: IEEE member numbers or email addresses
+            concurrency: Requests in flight at once (defaults to self.concurrency)
+            limiter: Start spacing shared with other runs (defaults to a new
+                one spaced `self.delay` apart)
             
-        Returns:
-            The extracted value or None
+        Yields:
+            Validation result dictionaries, in the order of member_numbers
         """
-        # Find the label text
-        label_element = soup.find(string=lambda text: text and label_text in text)
-        if not label_element:
-            return None
-        
-        # Get parent element (usually <strong>)
-        parent = label_element.find_parent()
-        if not parent:
-            return None
+        concurrency = max(1, concurrency or self.concurrency)
+        limiter = limiter or StartRateLimiter(self.delay)
+        dead_session = []
         
-        # Check for sibling <span> elements (common structure)
-        # Values are often in sibling spans after the label
-        next_sibling = parent.find_next_sibling()
-        if next_sibling:
-            # If it's a span, get its text
-            if next_sibling.name == 'span':
-                value = next_sibling.get_text(strip=True)
-                # For name initials, there might be multiple spans (e.g., "K" and "G")
-                if label_text == 'First and last name initials':
-                    spans = [next_sibling]
-                    # Collect all consecutive span siblings
-                    current = next_sibling.find_next_sibling()
-                    while current and current.name == 'span':
-                        spans.append(current)
-                        current = current.find_next_sibling()
-                    # Combine spans with periods and spaces
-                    if len(spans) > 1:
-                        values = [s.get_text(strip=True) for s in spans]
-                        return '. '.join(values) + '.' if values else None
-                if value:
-                    return value
-            else:
-                # If it's another element, get its text
-                value = next_sibling.get_text(strip=True)
-                if value and value not in label_text:
-                    return value
-        
-        # Try to extract value from the same element (after colon)
-        full_text = parent.get_text(separator=' ', strip=True)
-        if ':' in full_text:
-            parts = full_text.split(':', 1)
-            if len(parts) > 1:
-                value = parts[1].strip()
-                if value:
-                    return value
-        
-        # Try next element in parent's siblings
-        for sibling in parent.find_next_siblings():
-            text = sibling.get_text(strip=True)
-            if text and text not in label_text:
-                return text
-        
-        return None
-    
-    def _extract_name_initials(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract first and last name initials from the response."""
-        return self._extract_field_value(soup, 'First and last name initials')
-    
-    def _extract_membership_status(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract membership status (e.g., Active, Inactive)."""
-        return self._extract_field_value(soup, 'Membership status')
-    
-    def _extract_member_grade(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract IEEE member grade (e.g., Student Member, Member)."""
-        return self._extract_field_value(soup, 'IEEE member grade')
-    
-    def _extract_standards_association(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract Standards Association Member status (Yes/No)."""
-        return self._extract_field_value(soup, 'Standards Association Member')
-    
-    def _extract_society_memberships(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract society memberships as comma-separated string."""
-        # Look for "Society membership" section
-        label_element = soup.find(string=lambda text: text and 'Society membership' in text)
-        if not label_element:
-            return None
-        
-        parent = label_element.find_parent()
-        if not parent:
-            return None
-        
-        societies = []
-        
-        # First, try to find a list (ul/ol) after the label
-        list_elem = parent.find_next(['ul', 'ol'])
-        if list_elem:
-            for li in list_elem.find_all('li'):
-                text = li.get_text(strip=True)
-                if text and 'IEEE' in text:
-                    societies.append(text)
-            if societies:
-                return ', '.join(societies)
+        def paced_validate(member_number: str) -> Dict[str, Optional[str]]:
+            for attempt in range(2):
+                # Blocks while another thread is swapping the cookie
+                with self._cookie_lock:
+                    cookie_used = self.cookie
+                if dead_session:
+                    return self._error_result(member_number, dead_session[0])
                 
-        # If no list found, look for siblings or next elements
-        # Check parent's next siblings
-        for sibling in parent.find_next_siblings(['div', 'span', 'p', 'ul', 'ol']):
-            if sibling.name in ['ul', 'ol']:
-                for li in sibling.find_all('li'):
-                    text = li.get_text(strip=True)
-                    if text and 'IEEE' in text:
-                        societies.append(text)
-            else:
-                text = sibling.get_text(strip=True)
-                if text and 'IEEE' in text and 'Society' in text:
-                    societies.append(text)
+                limiter.acquire()
+                result = self.validate_member(member_number)
+                if attempt or not is_session_error(result):
+                    return result
+                if not self.refresh_cookie(cookie_used):
+                    dead_session.append(result['error'])
+                    return result
+            return result
         
-        # Also check elements that come after the parent in the document
-        for elem in parent.find_all_next(['li', 'div', 'span', 'p']):
-            text = elem.get_text(strip=True)
-            if text and 'IEEE' in text and 'Society' in text and 'Membership' in text:
-                if text not in societies:
-                    societies.append(text)
+        def resolve(item) -> Dict[str, Optional[str]]:
+            # Copies keep fanned-out duplicates independent of each other
+            return dict(item.result() if isinstance(item, Future) else item)
         
-        if societies:
-            return ', '.join(societies)
+        def ready(item) -> bool:
+            return not isinstance(item, Future) or item.done()
         
-        return None
+        window = concurrency * 2
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # (result or Future, member number if this entry submitted the lookup)
+            pending = deque()
+            # Lookups still in flight, then the most recent finished results
+            lookups = {}
+            recent = OrderedDict()
+            try:
+                for raw in member_numbers:
+                    member_number, error = normalize_member_id(raw)
+                    if error:
+                        pending.append((self._error_result(str(raw), error), None))
+                    elif member_number in lookups:
+                        pending.append((lookups[member_number], None))
+                    elif member_number in recent:
+                        recent.move_to_end(member_number)
+                        pending.append((recent[member_number], None))
+                    else:
+                        # Cache hits are answered without using a rate slot
+                        cached = self._cached_result(member_number)
+                        if cached:
+                            pending.append((cached, None))
+                        else:
+                            lookups[member_number] = executor.submit(paced_validate, member_number)
+                            pending.append((lookups[member_number], member_number))
+                    # Only submitted lookups count toward the window, so
+                    # duplicates, cache hits and errors never hold back new
+                    # submissions; finished results are yielded as they reach
+                    # the head.
+                    while pending and (len(lookups) >= window or ready(pending[0][0])):
+                        item, owner = pending.popleft()
+                        if owner is not None:
+                            del lookups[owner]
+                            recent[owner] = item.result()
+                            if len(recent) > RECENT_RESULTS:
+                                recent.popitem(last=False)
+                            item = recent[owner]
+                        yield resolve(item)
+                while pending:
+                    yield resolve(pending.popleft()[0])
+            finally:
+                for item, _ in pending:
+                    if isinstance(item, Future):
+                        item.cancel()
     
-    def validate_bulk(self, input_file: str, output_file: str):
+    def validate_bulk(self, input_file: str, output_file: str, column: Union[str, int] = 'ieee_number',
+                      resume: bool = False, journal_file: Optional[str] = None):
         """
-        Validate multiple members from an Excel file.
+        Validate multiple members from a roster file.
+        
+        Each result is appended to a journal as soon as it completes; the
+        output file is built from the journal at the end, so a crash or
+        Ctrl-C never loses finished work.
         
         Args:
-            input_file: Path to input Excel file (must have 'ieee_number' column)
-            output_file: Path to output Excel file
+            input_file: Path to input Excel, CSV or text file
+            output_file: Path to output Excel (.xlsx) or CSV (.csv) file
+            column: Member ID column name or zero-based index (default 'ieee_number')
+            resume: Skip members already validated in an existing journal
+            journal_file: Journal path (default: <output_file>.journal.jsonl)
         """
+        journal = ResultJournal(journal_file or f'{output_file}.journal.jsonl')
         try:
-            # Read input Excel file
+            # Open the roster; rows are read lazily as validation proceeds
             print(f"Reading member numbers from {input_file}...")
-            df = pd.read_excel(input_file)
+            roster = RosterReader(input_file, column)
+            total = roster.estimated_rows or '?'
             
-            # Validate column exists
-            if 'ieee_number' not in df.columns:
-                raise ValueError(f"Column 'ieee_number' not found in {input_file}. Available columns: {list(df.columns)}")
+            completed = journal.open(resume=resume)
+            if resume:
+                print(f"Resuming from {journal.path}: {len(completed)} members already validated.")
             
-            # Remove rows with empty member numbers
-            df = df.dropna(subset=['ieee_number'])
-            total = len(df)
+            # Roster rows still to validate; results come back in the same order
+            rows = deque()
             
-            print(f"Found {total} member numbers to validate.")
-            print(f"Starting validation (delay: {self.delay}s between requests)...\n")
+            def pending_members():
+                for row, member_number in enumerate(roster):
+                    if row not in completed:
+                        rows.append(row)
+                        yield member_number
             
-            # Validate each member
-            results = []
-            session_expired = False
-            for idx, row in df.iterrows():
-                member_number = str(row['ieee_number'])
-                print(f"[{idx + 1}/{total}] Validating: {member_number}", end=' ... ', flush=True)
-                
-                result = self.validate_member(member_number)
-                results.append(result)
-                
-                if result['error']:
-                    print(f"ERROR: {result['error']}")
-                    # Check if it's a session expiry error
-                    if 'Session expired' in result['error']:
-                        session_expired = True
-                        print(f"\n⚠️  Session expired! Stopping validation.")
-                        print(f"Processed {idx + 1} out of {total} members before session expired.")
-                        break
-                else:
-                    status = result['membership_status'] or 'Unknown'
-                    print(f"{status}")
-                
-                # Delay between requests
-                if idx < total - 1:  # Don't delay after last request
-                    time.sleep(self.delay)
+            print(f"Starting validation (delay: {self.delay}s between request starts, "
+                  f"concurrency: {self.concurrency})...\n")
             
-            # Create results DataFrame
-            results_df = pd.DataFrame(results)
+            # Validate members with pipelined requests
+            session_expired = False
+            try:
+                for idx, result in enumerate(self.validate_many(pending_members())):
+                    member_number = result['ieee_number']
+                    journal.append(rows.popleft(), result)
+                    
+                    if result['error']:
+                        print(f"[{idx + 1}/{total}] {member_number} ... ERROR: {result['error']}")
+                        # Check if it's a session expiry error
+                        if is_session_error(result):
+                            session_expired = True
+                            print(f"\n⚠️  Session expired! Stopping validation.")
+                            print(f"Processed {idx + 1} members before session expired.")
+                            print("Refresh the cookie and rerun with --resume to continue.")
+                            break
+                    else:
+                        status = result['membership_status'] or 'Unknown'
+                        print(f"[{idx + 1}/{total}] {member_number} ... {status}")
+            except KeyboardInterrupt:
+                print(f"\n🛑 Interrupted. Progress is saved in {journal.path}; rerun with --resume to continue.")
+            finally:
+                journal.close()
             
-            # Write to Excel
+            # Build the output from the journal
+            results = journal.results()
             print(f"\nWriting results to {output_file}...")
-            results_df.to_excel(output_file, index=False)
+            export_results(results, output_file)
             print(f"Validation complete! Results saved to {output_file}")
             
             # Print summary
@@ -363,14 +483,93 @@ Example usage:
         '--input',
         type=str,
         default='ieee_numbers.xlsx',
-        help='Input Excel file path (default: ieee_numbers.xlsx)'
+        help='Input Excel, CSV or text file path (default: ieee_numbers.xlsx)'
+    )
+    
+    parser.add_argument(
+        '--column',
+        type=str,
+        default='ieee_number',
+        help='Member ID column name or zero-based index (default: ieee_number)'
     )
     
     parser.add_argument(
         '--output',
         type=str,
         default='validated_output.xlsx',
-        help='Output Excel file path (default: validated_output.xlsx)'
+        help='Output Excel (.xlsx) or CSV (.csv) file path (default: validated_output.xlsx)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip members already validated in the journal of a previous run'
+    )
+    
+    parser.add_argument(
+        '--journal',
+        type=str,
+        help='Result journal path (default: <output>.journal.jsonl)'
+    )
+    
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=3,
+        help='Requests in flight at once; starts stay 0.7s apart (default: 3)'
+    )
+    
+    parser.add_argument(
+        '--cookie-wait',
+        type=int,
+        default=60,
+        help='Seconds to wait for a fresh cookie (ieee_cookie.txt or .env) when the session expires (default: 60)'
+    )
+    
+    parser.add_argument(
+        '--auto-login',
+        action='store_true',
+        help='Run ieee_login.py to get a new cookie if none is available when the session expires'
+    )
+    
+    parser.add_argument(
+        '--no-cookie-refresh',
+        action='store_true',
+        help='Stop the run on session expiry instead of swapping in a fresh cookie'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default=DEFAULT_CACHE_FILE,
+        help='SQLite result cache path (default: validation_cache.sqlite3 next to this script)'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=DEFAULT_TTL,
+        help=f'Seconds a cached result stays valid when no --cache-ttl-rules rule matches (default: {DEFAULT_TTL})'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl-rules',
+        type=str,
+        default=os.getenv('RESULT_TTL_RULES', DEFAULT_RULES),
+        help=f'Cache lifetimes by membership status and grade, e.g. "{DEFAULT_RULES}" '
+             '(default: RESULT_TTL_RULES or that example; pass "" to always use --cache-ttl)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always query IEEE instead of using cached results'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream responses and stop reading once the membership block is parsed'
     )
     
     args = parser.parse_args()
@@ -381,8 +580,8 @@ Example usage:
     if args.cookie:
         cookie = args.cookie
     else:
-        # Try to read from cookie file
-        cookie_file = "ieee_cookie.txt"
+        # Try to read from the cookie file next to this script
+        cookie_file = COOKIE_FILE
         if os.path.exists(cookie_file):
             try:
                 with open(cookie_file, 'r') as f:
@@ -400,8 +599,23 @@ Example usage:
             sys.exit(1)
     
     # Initialize validator and run
-    validator = IEEEMembershipValidator(cookie)
-    validator.validate_bulk(args.input, args.output)
+    cookie_provider = None
+    if not args.no_cookie_refresh:
+        cookie_provider = default_cookie_provider(allow_login=args.auto_login)
+    result_cache = None
+    if not args.no_cache:
+        try:
+            policy = TTLPolicy.parse(args.cache_ttl_rules, float(os.getenv('RESULT_TTL_JITTER', DEFAULT_JITTER)))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        result_cache = SQLiteResultCache(args.cache, ttl=args.cache_ttl, policy=policy)
+    validator = IEEEMembershipValidator(cookie, stream=args.stream, cookie_provider=cookie_provider,
+                                        result_cache=result_cache)
+    validator.concurrency = args.concurrency
+    validator.cookie_wait = args.cookie_wait
+    validator.validate_bulk(args.input, args.output, args.column,
+                            resume=args.resume, journal_file=args.journal)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Member ID normalization shared by every validation entry point.
+
+Canonicalizes IEEE member numbers and email addresses before any network
+call, so spreadsheet artifacts ("94012345.0"), stray whitespace and case
+differences collapse to one upstream lookup and malformed values are
+rejected locally.
+"""
+
+import math
+import re
+from typing import Optional, Tuple
+
+# IEEE member numbers are 8-9 digits
+MEMBER_NUMBER_DIGITS = (8, 9)
+
+# Numeric spreadsheet cells lose leading zeros; a number one digit short of
+# this width is padded back. Anything shorter is junk, not a lost zero.
+MEMBER_NUMBER_PAD = 8
+
+_FLOAT_ARTIFACT = re.compile(r'^(\d+)\.0+$')
+_SEPARATORS = re.compile(r'[\s\-]')
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def _invalid(text: str) -> Tuple[None, str]:
+    low, high = MEMBER_NUMBER_DIGITS[0], MEMBER_NUMBER_DIGITS[-1]
+    return None, f"Invalid IEEE member number '{text}': expected {low}-{high} digits or an email address"
+
+
+def normalize_member_id(value) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Canonicalize a member number or email address.
+
+    Args:
+        value: Raw value from a form, spreadsheet cell or API payload
+
+    Returns:
+        Tuple of (canonical ID, None) or (None, error message)
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None, 'Invalid member ID: value is empty'
+
+    from_number = False
+    if isinstance(value, bool):
+        return _invalid(str(value))
+    if isinstance(value, int):
+        text, from_number = str(value), True
+    elif isinstance(value, float):
+        if not value.is_integer():
+            return _invalid(str(value))
+        text, from_number = str(int(value)), True
+    else:
+        text = str(value).strip().strip('"\'').strip()
+
+    if not text:
+        return None, 'Invalid member ID: value is empty'
+
+    if '@' in text:
+        email = text.lower()
+        if not _EMAIL.match(email):
+            return None, f"Invalid email address '{text}'"
+        return email, None
+
+    # "94012345.0" is a numeric cell that went through a float column
+    artifact = _FLOAT_ARTIFACT.match(text)
+    if artifact:
+        text, from_number = artifact.group(1), True
+
+    digits = _SEPARATORS.sub('', text)
+    if not digits.isdigit():
+        return _invalid(text)
+
+    if from_number and len(digits) == MEMBER_NUMBER_PAD - 1:
+        digits = digits.zfill(MEMBER_NUMBER_PAD)
+
+    if not MEMBER_NUMBER_DIGITS[0] <= len(digits) <= MEMBER_NUMBER_DIGITS[-1]:
+        return _invalid(text)
+
+    return digits, None
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+IEEE Membership Page Parser
+
+Extracts membership fields from the IEEE membership validator HTML page.
+Shared by the bulk validator, the Flask apps and the Redis worker so that
+every entry point parses a response the same way.
+"""
+
+from bs4 import BeautifulSoup, NavigableString
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+STATUS_SECTION_LABEL = 'Membership validation status'
+NAME_INITIALS_LABEL = 'First and last name initials'
+SOCIETY_LABEL = 'Society membership'
+
+# Result field -> label text shown on the validator page
+FIELD_LABELS = {
+    'name_initials': NAME_INITIALS_LABEL,
+    'membership_status': 'Membership status',
+    'member_grade': 'IEEE member grade',
+    'standards_association_member': 'Standards Association Member',
+}
+
+# Tags inspected when scanning past the society label for extra memberships
+SOCIETY_SCAN_TAGS = ('li', 'div', 'span', 'p')
+
+
+class MembershipExtractor:
+    """Walks a validator page once and extracts every membership field."""
+
+    def __init__(self, parser: str = DEFAULT_PARSER, deep_society_scan: bool = True,
+                 collect_text: bool = False):
+        """
+        Initialize the extractor.
+
+        Args:
+            parser: BeautifulSoup tree builder ('lxml' or 'html.parser')
+            deep_society_scan: Also scan the rest of the document for
+                "IEEE ... Society Membership" entries when no list is found
+            collect_text: Also return the visible 'page_text'; the walk then
+                always covers the whole document
+        """
+        self.parser = parser
+        self.deep_society_scan = deep_society_scan
+        self.collect_text = collect_text
+
+    def parse(self, html: str) -> Dict:
+        """
+        Parse an HTML page and extract the membership record.
+
+        Args:
+            html: HTML text of the validator response
+
+        Returns:
+            Dictionary with the extracted fields, 'status_section_found'
+            and, with collect_text, the visible 'page_text'
+        """
+        return self.extract(BeautifulSoup(html, self.parser))
+
+    def extract(self, soup: BeautifulSoup) -> Dict:
+        """
+        Extract the membership record from an already parsed document.
+
+        All labels are located in a single walk over the tree instead of
+        one full search per field. The walk stops once every label has been
+        found unless the page text is being collected.
+
+        Args:
+            soup: BeautifulSoup object of the HTML response
+
+        Returns:
+            Dictionary with the extracted fields, 'status_section_found'
+            and, with collect_text, the visible 'page_text'
+        """
+        labels = dict(FIELD_LABELS)
+        labels['status_section'] = STATUS_SECTION_LABEL
+        labels['society_memberships'] = SOCIETY_LABEL
+
+        text_types = soup.interesting_string_types
+        page_text = []
+        found = {}
+
+        for node in soup.descendants:
+            if not isinstance(node, NavigableString):
+                continue
+
+            if self.collect_text and type(node) in text_types:
+                page_text.append(node)
+
+            if labels:
+                for key, label in list(labels.items()):
+                    if label in node:
+                        found[key] = node
+                        del labels[key]
+            elif not self.collect_text:
+                break
+
+        record = {'status_section_found': 'status_section' in found}
+        if self.collect_text:
+            record['page_text'] = ''.join(page_text)
+        for key, label in FIELD_LABELS.items():
+            record[key] = self._field_value(found.get(key), label)
+        record['society_memberships'] = self._society_memberships(found.get('society_memberships'))
+        return record
+
+    def _field_value(self, label_element: Optional[NavigableString], label_text: str) -> Optional[str]:
+        """
+        Extract a field value next to its label.
+
+        Args:
+            label_element: First string in the document containing the label
+            label_text: The label text (e.g., "First and last name initials")
+
+        Returns:
+            The extracted value or None
+        """
+        if label_element is None:
+            return None
+
+        # Get parent element (usually <strong>)
+        parent = label_element.find_parent()
+        if not parent:
+            return None
+
+        # Values are often in sibling spans after the label
+        next_sibling = parent.find_next_sibling()
+        if next_sibling:
+            if next_sibling.name == 'span':
+                value = next_sibling.get_text(strip=True)
+                # For name initials, there might be multiple spans (e.g., "K" and "G")
+                if label_text == NAME_INITIALS_LABEL:
+                    spans = [next_sibling]
+                    current = next_sibling.find_next_sibling()
+                    while current and current.name == 'span':
+                        spans.append(current)
+                        current = current.find_next_sibling()
+                    if len(spans) > 1:
+                        values = [s.get_text(strip=True) for s in spans]
+                        return '. '.join(values) + '.' if values else None
+                if value:
+                    return value
+            else:
+                value = next_sibling.get_text(strip=True)
+                if value and value not in label_text:
+                    return value
+
+        # Try to extract value from the same element (after colon)
+        full_text = parent.get_text(separator=' ', strip=True)
+        if ':' in full_text:
+            value = full_text.split(':', 1)[1].strip()
+            if value:
+                return value
+
+        # Try next element in parent's siblings
+        for sibling in parent.find_next_siblings():
+            text = sibling.get_text(strip=True)
+            if text and text not in label_text:
+                return text
+
+        return None
+
+    def _society_memberships(self, label_element: Optional[NavigableString]) -> Optional[str]:
+        """
+        Extract society memberships as a comma-separated string.
+
+        Args:
+            label_element: First string in the document containing "Society membership"
+
+        Returns:
+            Comma-separated society memberships or None
+        """
+        if label_element is None:
+            return None
+
+        parent = label_element.find_parent()
+        if not parent:
+            return None
+
+        societies = []
+
+        # First, try to find a list (ul/ol) after the label
+        list_elem = parent.find_next(['ul', 'ol'])
+        if list_elem:
+            for li in list_elem.find_all('li'):
+                text = li.get_text(strip=True)
+                if text and 'IEEE' in text:
+                    societies.append(text)
+            if societies:
+                return ', '.join(societies)
+
+        # If no list found, look at the parent's next siblings
+        for sibling in parent.find_next_siblings(['div', 'span', 'p', 'ul', 'ol']):
+            if sibling.name in ['ul', 'ol']:
+                for li in sibling.find_all('li'):
+                    text = li.get_text(strip=True)
+                    if text and 'IEEE' in text:
+                        societies.append(text)
+            else:
+                text = sibling.get_text(strip=True)
+                if text and 'IEEE' in text and 'Society' in text:
+                    societies.append(text)
+
+        # Also check elements that come after the parent in the document.
+        # Only ancestors of strings mentioning "Society" can match, so the
+        # rest of the document is walked once, and only when no list matched.
+        if self.deep_society_scan:
+            for elem in self._elements_after(parent):
+                text = elem.get_text(strip=True)
+                if text and 'IEEE' in text and 'Society' in text and 'Membership' in text:
+                    if text not in societies:
+                        societies.append(text)
+
+        if societies:
+            return ', '.join(societies)
+
+        return None
+
+    def _elements_after(self, parent) -> List:
+        """Return scan-tag elements after parent that contain "Society", in document order."""
+        order = {id(parent): 0}
+        hits = []
+        for position, node in enumerate(parent.next_elements, 1):
+            if isinstance(node, NavigableString):
+                if 'Society' in node:
+                    hits.append(node)
+            else:
+                order[id(node)] = position
+        candidates = {}
+        for hit in hits:
+            for ancestor in hit.parents:
+                position = order.get(id(ancestor), -1)
+                if position <= 0:
+                    break
+                if ancestor.name in SOCIETY_SCAN_TAGS:
+                    candidates[position] = ancestor
+        return [candidates[position] for position in sorted(candidates)]
+
+
+class MembershipStreamWatcher(HTMLParser):
+    """
+    Incremental HTML watcher used while a response is still downloading.
+
+    Fed chunk by chunk, it reports when the rest of the page can no longer
+    change the extracted record: every label has been seen and the society
+    list that follows "Society membership" has been closed with at least one
+    IEEE entry, or the page is clearly a sign-in form.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pending_labels = set(FIELD_LABELS.values())
+        self.status_section_seen = False
+        self.society_seen = False
+        self.society_list_closed = False
+        self.list_depth = 0
+        self.list_has_society = False
+        self.login_page = False
+        self.complete = False
+        # Text since the last tag; feed() chunks can split it anywhere
+        self.text_parts: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        """True once the remaining bytes are not needed for parsing."""
+        return self.complete or self.login_page
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        # A password box before any result is a sign-in page
+        if tag == 'input' and not self.status_section_seen:
+            if (dict(attrs).get('type') or '').lower() == 'password':
+                self.login_page = True
+        if self.society_seen and not self.society_list_closed and tag in ('ul', 'ol'):
+            self.list_depth += 1
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        if self.list_depth and tag in ('ul', 'ol'):
+            self.list_depth -= 1
+            if self.list_depth == 0:
+                # The first list after the label decides the society field;
+                # without an IEEE entry the parser falls back to a full scan.
+                self.society_list_closed = True
+                self.complete = (self.list_has_society and self.status_section_seen
+                                 and not self.pending_labels)
+
+    def handle_data(self, data):
+        self.text_parts.append(data)
+
+    def flush_text(self):
+        """Match the labels against the text collected since the last tag."""
+        if not self.text_parts:
+            return
+        data = ''.join(self.text_parts)
+        self.text_parts = []
+        if not self.status_section_seen and STATUS_SECTION_LABEL in data:
+            self.status_section_seen = True
+        if self.pending_labels:
+            self.pending_labels = {label for label in self.pending_labels if label not in data}
+        if not self.society_seen and SOCIETY_LABEL in data:
+            self.society_seen = True
+        elif self.list_depth and 'IEEE' in data:
+            self.list_has_society = True
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Request pacing for calls to the IEEE membership validator.
+
+The limiter spaces request *starts* rather than sleeping after each
+response, so overlapping requests keep the configured rate without paying
+the round-trip and parse time on top of the delay. SharedRateLimiter applies
+the same schedule across processes (e.g. gunicorn workers) on one host.
+"""
+
+import math
+import os
+import struct
+import threading
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock/pread, so the limit is per process
+    fcntl = None
+
+
+class StartRateLimiter:
+    """Thread-safe token bucket keyed on request start times."""
+
+    def __init__(self, interval: float, burst: int = 1):
+        """
+        Initialize the limiter.
+
+        Args:
+            interval: Minimum spacing between request starts (seconds)
+            burst: Number of starts allowed back to back after an idle period
+        """
+        self.interval = interval
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._next_start = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Reserve the next start slot without waiting.
+
+        Returns:
+            Seconds the caller must wait before starting its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Idle time refills the bucket up to `burst` slots
+            start = max(self._next_start, now - (self.burst - 1) * self.interval)
+            self._next_start = start + self.interval
+        return max(0.0, start - now)
+
+    def acquire(self):
+        """Block until the caller may start its request."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than allowed."""
+
+    def __init__(self, wait: float, queued: int):
+        self.wait = wait
+        self.queued = queued
+        self.retry_after = max(1, math.ceil(wait))
+        super().__init__(f"{queued} requests queued, retry in {self.retry_after}s")
+
+
+class SharedRateLimiter:
+    """
+    Start-time token bucket shared by every process on the host.
+
+    The next free start time is stored in a small state file and updated
+    under an exclusive flock(), so all gunicorn workers draw from one budget.
+    """
+
+    _STATE = struct.Struct('d')
+
+    # A stored start time further ahead than this means the wall clock
+    # moved backwards; the schedule is reset instead of stalling
+    MAX_AHEAD = 3600
+
+    def __init__(self, path: str, interval: float, burst: int = 1):
+        """
+        Initialize the limiter.
+
+        Args:
+            path: State file shared by all processes (created if missing)
+            interval: Minimum spacing between request starts (seconds)
+            burst: Number of starts allowed back to back after an idle period
+        """
+        self.path = path
+        self.interval = interval
+        self.burst = max(1, burst)
+        # flock() does not exclude threads sharing one descriptor
+        self._lock = threading.Lock()
+        self._fd = None
+        self._pid = None
+        # Next free slot, used instead of the state file when fcntl is missing
+        self._next_start: Optional[float] = None
+
+    def _descriptor(self) -> int:
+        """Return this process's state file descriptor, reopening it after a fork."""
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve the next start slot without waiting.
+
+        Args:
+            max_wait: Longest acceptable wait; beyond it nothing is reserved
+
+        Returns:
+            Seconds the caller must wait before starting its request
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed `max_wait`
+        """
+        with self._lock:
+            if fcntl is None:
+                wait, self._next_start = self._take(self._next_start, max_wait)
+                return wait
+
+            fd = self._descriptor()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(fd, self._STATE.size, 0)
+                next_start = self._STATE.unpack(data)[0] if len(data) == self._STATE.size else None
+                wait, next_start = self._take(next_start, max_wait)
+                os.pwrite(fd, self._STATE.pack(next_start), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return wait
+
+    def _take(self, next_start: Optional[float], max_wait: Optional[float]):
+        """
+        Take the next slot given the stored next free slot.
+
+        Returns:
+            (seconds to wait, new next free slot)
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed `max_wait`
+        """
+        now = time.time()
+        if next_start is None or next_start - now > self.MAX_AHEAD:
+            next_start = now
+
+        # Idle time refills the bucket up to `burst` slots
+        start = max(next_start, now - (self.burst - 1) * self.interval)
+        wait = max(0.0, start - now)
+        if max_wait is not None and wait > max_wait:
+            raise RateLimitExceeded(wait, round(wait / self.interval))
+        return wait, start + self.interval
+
+    def acquire(self, max_wait: Optional[float] = None):
+        """
+        Block until the caller may start its request.
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed `max_wait`
+        """
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Local result cache for IEEE membership lookups.
+
+Successful validation results are kept per canonical member ID so re-runs
+and repeated registrations are answered locally instead of going to IEEE.
+The default backend is a SQLite file shared by the CLI and the Flask apps.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from ttl_policy import TTLPolicy
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_FILE = os.path.join(BASE_DIR, 'validation_cache.sqlite3')
+DEFAULT_TTL = 24 * 60 * 60  # 24 hours
+DEFAULT_NEGATIVE_TTL = 15 * 60  # "No such member" answers, as in the Redis worker
+DEFAULT_MAX_ENTRIES = 50000
+
+
+class ResultCache(ABC):
+    """Base class for result caches."""
+
+    @abstractmethod
+    def get(self, member_id: str) -> Optional[Dict]:
+        """Return the cached result for a canonical member ID, or None."""
+
+    @abstractmethod
+    def set(self, member_id: str, result: Dict, ttl: Optional[int] = None):
+        """
+        Store a result.
+
+        Args:
+            member_id: Canonical member ID
+            result: Validation result dictionary
+            ttl: Lifetime in seconds (defaults to the cache's TTL policy)
+        """
+
+
+class SQLiteResultCache(ResultCache):
+    """SQLite-backed cache with TTL expiry and size-bounded eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl: int = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, policy: Optional[TTLPolicy] = None,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            ttl: Default entry lifetime in seconds
+            max_entries: Oldest entries are evicted beyond this size
+            policy: Picks each entry's lifetime from its membership status
+                and grade, falling back to `ttl` (None: always `ttl`)
+            negative_ttl: Lifetime of a result without a membership status,
+                i.e. a member IEEE did not find, who may register any day
+        """
+        self.path = path
+        self.ttl = ttl
+        self.policy = policy
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, reopening it after a fork."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'member_id TEXT PRIMARY KEY, result TEXT NOT NULL, '
+                'stored_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)')
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, member_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT result FROM results WHERE member_id = ? AND expires_at > ?',
+                (member_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, member_id: str, result: Dict, ttl: Optional[int] = None):
+        now = time.time()
+        lifetime = ttl
+        if lifetime is None:
+            lifetime = self.ttl
+            if not result.get('membership_status'):
+                lifetime = self.negative_ttl
+            elif self.policy is not None:
+                lifetime = self.policy.ttl(result.get('membership_status'), result.get('member_grade'), self.ttl)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO results (member_id, result, stored_at, expires_at) VALUES (?, ?, ?, ?)',
+                (member_id, json.dumps(result), now, now + lifetime)
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the oldest ones beyond max_entries."""
+        conn.execute('DELETE FROM results WHERE expires_at <= ?', (now,))
+        count = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                'DELETE FROM results WHERE member_id IN '
+                '(SELECT member_id FROM results ORDER BY stored_at LIMIT ?)',
+                (count - self.max_entries,)
+            )
+        conn.commit()
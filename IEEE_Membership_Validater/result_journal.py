@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Crash-safe result journal for bulk validation.
+
+Every result is appended to a JSONL file, tagged with its roster row, and
+flushed to disk as soon as it completes, so an interrupted run can be
+resumed and the final Excel/CSV file is always rebuilt from what was
+actually validated.
+"""
+
+import csv
+import json
+import os
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set
+
+import pandas as pd
+
+# Column order of exported result files
+RESULT_COLUMNS = [
+    'ieee_number',
+    'name_initials',
+    'membership_status',
+    'member_grade',
+    'standards_association_member',
+    'society_memberships',
+    'error'
+]
+
+
+class ResultJournal:
+    """Append-only JSONL journal of validation results."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Path to the JSONL journal file
+        """
+        self.path = path
+        self._file = None
+
+    def open(self, resume: bool = False) -> Set[int]:
+        """
+        Open the journal for appending.
+
+        Args:
+            resume: Keep existing entries instead of starting a fresh journal
+
+        Returns:
+            Roster rows already validated without error
+        """
+        completed = set()
+        if resume:
+            for row, result in self._latest().items():
+                if not result.get('error'):
+                    completed.add(row)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        return completed
+
+    def append(self, row: int, result: Dict[str, Optional[str]]):
+        """
+        Append one result and force it to disk.
+
+        Args:
+            row: Zero-based roster row the result belongs to
+            result: Validation result dictionary
+        """
+        self._file.write(json.dumps({'row': row, **result}) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read(self) -> List[Dict[str, Optional[str]]]:
+        """
+        Read every journal entry in write order.
+
+        A torn last line left by a crash is ignored.
+        """
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def _latest(self) -> Dict[int, Dict[str, Optional[str]]]:
+        """Return the latest entry per roster row."""
+        latest = {}
+        for entry in self.read():
+            latest[entry.pop('row')] = entry
+        return latest
+
+    def results(self) -> List[Dict[str, Optional[str]]]:
+        """
+        Return the latest result per roster row, in roster order.
+
+        Rows retried on resume keep their original position.
+        """
+        latest = self._latest()
+        return [latest[row] for row in sorted(latest)]
+
+
+def export_results(results: List[Dict[str, Optional[str]]], output_file: str):
+    """
+    Write results to an Excel or CSV file, chosen by extension.
+
+    Args:
+        results: Validation result dictionaries
+        output_file: Path ending in .csv for CSV, anything else for Excel
+    """
+    df = pd.DataFrame(results)
+    if output_file.lower().endswith('.csv'):
+        df.to_csv(output_file, index=False)
+    else:
+        df.to_excel(output_file, index=False)
+
+
+class _LineBuffer:
+    """File-like sink that hands back what csv.writer writes."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(results: Iterable[Dict[str, Optional[str]]]) -> Iterator[str]:
+    """Yield results as CSV text, one row at a time, header first."""
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(RESULT_COLUMNS)
+    for result in results:
+        yield writer.writerow([result.get(column) for column in RESULT_COLUMNS])
+
+
+def iter_jsonl(results: Iterable[Dict[str, Optional[str]]]) -> Iterator[str]:
+    """Yield results as JSON lines."""
+    for result in results:
+        yield json.dumps({column: result.get(column) for column in RESULT_COLUMNS}) + '\n'
+
+
+def write_xlsx(results: Iterable[Dict[str, Optional[str]]], file: BinaryIO):
+    """
+    Write results to an Excel workbook row by row.
+
+    Args:
+        results: Validation result dictionaries
+        file: Binary file object to save the workbook to
+    """
+    from openpyxl import Workbook
+
+    # Write-only mode keeps one row in memory instead of the whole sheet
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(RESULT_COLUMNS)
+    for result in results:
+        sheet.append([result.get(column) for column in RESULT_COLUMNS])
+    workbook.save(file)
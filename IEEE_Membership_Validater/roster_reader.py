@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Streaming roster reader for bulk validation.
+
+Yields member IDs one row at a time from XLSX (openpyxl read-only mode),
+CSV or plain text files, so validation starts on the first row and memory
+stays flat regardless of roster size.
+"""
+
+import csv
+import os
+from typing import Iterator, List, Optional, Union
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+CSV_EXTENSIONS = ('.csv',)
+TEXT_EXTENSIONS = ('.txt', '')
+
+
+class RosterReader:
+    """Lazily reads member IDs from a single column of a roster file."""
+
+    def __init__(self, path: str, column: Union[str, int] = 'ieee_number', header: bool = True):
+        """
+        Open the roster and resolve the member ID column.
+
+        Args:
+            path: Path to an .xlsx/.xlsm, .csv or plain text (.txt or no
+                extension) file
+            column: Column name, or zero-based column index
+            header: Whether the first row holds column names (ignored for
+                plain text, which has one ID per line and no header)
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file type is unsupported or the column cannot be found
+        """
+        self.path = path
+        self.column = column
+        self.header = header
+        self.estimated_rows: Optional[int] = None
+
+        extension = os.path.splitext(path)[1].lower()
+        if extension in EXCEL_EXTENSIONS:
+            self.format = 'xlsx'
+        elif extension in CSV_EXTENSIONS:
+            self.format = 'csv'
+        elif extension in TEXT_EXTENSIONS:
+            self.format = 'text'
+        else:
+            supported = ', '.join(EXCEL_EXTENSIONS + CSV_EXTENSIONS + ('.txt',))
+            raise ValueError(f"Unsupported roster file type '{extension}': use {supported} "
+                             "or a plain text file without an extension")
+
+        self._workbook = None
+        self._file = None
+        self._rows = self._open()
+        self._index = self._resolve_column()
+
+    def _open(self) -> Iterator:
+        """Open the underlying file and return a row iterator."""
+        if self.format == 'xlsx':
+            from openpyxl import load_workbook
+
+            self._workbook = load_workbook(self.path, read_only=True, data_only=True)
+            sheet = self._workbook.active
+            if sheet.max_row:
+                self.estimated_rows = sheet.max_row - (1 if self.header else 0)
+            return sheet.iter_rows(values_only=True)
+
+        # utf-8-sig drops the BOM Excel adds when saving CSV
+        self._file = open(self.path, 'r', newline='', encoding='utf-8-sig')
+        if self.format == 'csv':
+            return csv.reader(self._file)
+        return ([line.rstrip('\r\n')] for line in self._file)
+
+    def _resolve_column(self) -> int:
+        """Read the header row (if any) and return the column index."""
+        if self.format == 'text':
+            return 0
+
+        names: List[str] = []
+        if self.header:
+            first = next(self._rows, None)
+            names = [str(name).strip() if name is not None else '' for name in (first or ())]
+
+        if isinstance(self.column, int) or str(self.column).isdigit():
+            return int(self.column)
+
+        if self.column not in names:
+            self.close()
+            raise ValueError(f"Column '{self.column}' not found in {self.path}. Available columns: {names}")
+        return names.index(self.column)
+
+    def __iter__(self) -> Iterator[Union[str, int, float]]:
+        """
+        Yield non-empty member IDs one row at a time.
+
+        Text values are stripped; numeric spreadsheet cells are yielded as
+        numbers so normalization can restore lost leading zeros.
+        """
+        try:
+            for row in self._rows:
+                if self._index >= len(row):
+                    continue
+                value = row[self._index]
+                if isinstance(value, str):
+                    value = value.strip()
+                if value is None or value == '':
+                    continue
+                yield value
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the workbook or file handle."""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
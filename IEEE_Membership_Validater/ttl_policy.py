@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Cache lifetimes for membership results, shared by every cache.
+
+An active membership rarely changes before the membership year ends, while
+an inactive one may be renewed any day, so the lifetime depends on the
+membership status and member grade. Each lifetime is jittered so results
+stored together (an imported roster) do not all expire at the same moment.
+
+Rules are written as comma-separated ``STATUS[/GRADE]=DURATION`` entries.
+STATUS and GRADE are case-insensitive shell patterns, a missing GRADE
+matches any grade and the first matching rule wins. DURATION is seconds,
+optionally with an s, m, h or d suffix, e.g.
+``active/student*=3d,active=7d,inactive=6h``.
+"""
+
+import fnmatch
+import os
+import random
+from typing import List, Optional, Tuple
+
+DEFAULT_RULES = 'active/student*=3d,active=7d,inactive=6h'
+DEFAULT_JITTER = 0.1  # Lifetimes vary by up to +/-10%
+
+_UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_duration(text: str) -> int:
+    """
+    Parse a duration such as '900', '15m', '6h' or '7d' into seconds.
+
+    Raises:
+        ValueError: If the duration is malformed
+    """
+    text = text.strip().lower()
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(float(text))
+
+
+class TTLPolicy:
+    """Maps a result's membership status and grade to a jittered lifetime."""
+
+    def __init__(self, rules: List[Tuple[str, str, int]], jitter: float = DEFAULT_JITTER):
+        """
+        Initialize the policy.
+
+        Args:
+            rules: (status pattern, grade pattern, seconds) in priority order
+            jitter: Fraction by which each lifetime is randomly varied
+        """
+        self.rules = [(status.lower(), grade.lower(), seconds) for status, grade, seconds in rules]
+        self.jitter = jitter
+
+    @classmethod
+    def parse(cls, spec: str, jitter: float = DEFAULT_JITTER) -> 'TTLPolicy':
+        """
+        Build a policy from a rule string (see the module docstring).
+
+        Raises:
+            ValueError: If a rule is malformed
+        """
+        rules = []
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            pattern, sep, duration = item.partition('=')
+            if not sep:
+                raise ValueError(f"Invalid TTL rule '{item}': expected STATUS[/GRADE]=DURATION")
+            status, _, grade = pattern.partition('/')
+            rules.append((status.strip() or '*', grade.strip() or '*', parse_duration(duration)))
+        return cls(rules, jitter)
+
+    @classmethod
+    def from_env(cls) -> 'TTLPolicy':
+        """Build the policy from RESULT_TTL_RULES and RESULT_TTL_JITTER."""
+        return cls.parse(os.getenv('RESULT_TTL_RULES', DEFAULT_RULES),
+                         float(os.getenv('RESULT_TTL_JITTER', DEFAULT_JITTER)))
+
+    def base_ttl(self, status: Optional[str], grade: Optional[str], default: int) -> int:
+        """Return the lifetime of the first matching rule, or `default`."""
+        status = (status or '').strip().lower()
+        grade = (grade or '').strip().lower()
+        for status_pattern, grade_pattern, seconds in self.rules:
+            if fnmatch.fnmatchcase(status, status_pattern) and fnmatch.fnmatchcase(grade, grade_pattern):
+                return seconds
+        return default
+
+    def ttl(self, status: Optional[str], grade: Optional[str], default: int) -> int:
+        """
+        Return the jittered lifetime in seconds for a result.
+
+        Args:
+            status: Membership status, e.g. 'Active'
+            grade: Member grade, e.g. 'Student Member'
+            default: Lifetime when no rule matches
+        """
+        seconds = self.base_ttl(status, grade, default)
+        if self.jitter > 0:
+            seconds *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(1, int(seconds))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Background validation jobs for the web app.
+
+A job validates a list of member IDs on a worker thread while the HTTP
+request that created it returns immediately. Progress and partial results
+can be read at any time by job ID. Jobs live in process memory, so the web
+app must run as a single process.
+"""
+
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from ieee_validator import IEEEMembershipValidator
+from rate_limiter import StartRateLimiter
+
+# Finished jobs are dropped this long after completion
+DEFAULT_JOB_TTL = 60 * 60  # 1 hour
+
+
+class ValidationJob:
+    """One bulk validation run and its results so far."""
+
+    def __init__(self, member_ids: List[str]):
+        """
+        Initialize the job.
+
+        Args:
+            member_ids: Member numbers or emails to validate, in order
+        """
+        self.id = uuid.uuid4().hex
+        self.member_ids = member_ids
+        self.total = len(member_ids)
+        self.results: List[Dict[str, Optional[str]]] = []
+        self.status = 'queued'
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Guards results; notified on every new result and on completion
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def run(self, validator: IEEEMembershipValidator, limiter: Optional[StartRateLimiter] = None):
+        """
+        Validate every member, appending each result as it completes.
+
+        Args:
+            validator: Validator holding the caller's cookie
+            limiter: Start spacing shared by all jobs running at once
+        """
+        self.started_at = time.time()
+        self.status = 'running'
+        status = 'done'
+        try:
+            for result in validator.validate_many(self.member_ids, limiter=limiter):
+                with self._changed:
+                    self.results.append(result)
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = str(e)
+            status = 'failed'
+        with self._changed:
+            # finished_at is set first so a finished job always has it
+            self.finished_at = time.time()
+            self.status = status
+            self._changed.notify_all()
+
+    def results_since(self, offset: int = 0) -> List[Dict[str, Optional[str]]]:
+        """Return results from position `offset` onwards."""
+        with self._changed:
+            return self.results[offset:]
+
+    def wait_for_results(self, offset: int, timeout: float) -> List[Dict[str, Optional[str]]]:
+        """
+        Block until there are results past `offset`, the job finishes or
+        `timeout` seconds pass.
+
+        Returns:
+            Results from position `offset` onwards (possibly empty)
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.results) > offset or self.finished, timeout)
+            return self.results[offset:]
+
+    def progress(self) -> Dict:
+        """
+        Return a progress snapshot.
+
+        Returns:
+            Dictionary with status, done/total, elapsed seconds, throughput
+            (members per second) and ETA in seconds (None until known)
+        """
+        # Status is read first: a finished status implies every result is in
+        status = self.status
+        with self._changed:
+            done = len(self.results)
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        throughput = done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if status in ('done', 'failed'):
+            eta = 0.0
+        elif throughput > 0:
+            eta = (self.total - done) / throughput
+        return {
+            'job_id': self.id,
+            'status': status,
+            'done': done,
+            'total': self.total,
+            'elapsed': round(elapsed, 2),
+            'throughput': round(throughput, 2),
+            'eta': round(eta, 1) if eta is not None else None,
+            'error': self.error
+        }
+
+
+class JobStore:
+    """Thread-safe registry of validation jobs by ID."""
+
+    def __init__(self, ttl: int = DEFAULT_JOB_TTL):
+        """
+        Initialize the store.
+
+        Args:
+            ttl: Seconds a finished job is kept before it is dropped
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ValidationJob] = {}
+
+    def create(self, member_ids: List[str]) -> ValidationJob:
+        """Register a new job for `member_ids`."""
+        job = ValidationJob(member_ids)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ValidationJob]:
+        """Return the job with this ID, or None if unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        """Drop finished jobs older than the TTL."""
+        cutoff = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
@@ -16,7 +16,36 @@ const app = express();
 const PORT = process.env.PORT || 3001;
 const REDIS_URL = process.env.REDIS_URL || 'redis://localhost:6379';
 const QUEUE_NAME = 'ieee_validation_queue';
+// Priority lanes consumed by the worker, highest priority first
+const LANES = {
+  interactive: QUEUE_NAME,
+  bulk: `${QUEUE_NAME}:bulk`,
+  refresh: `${QUEUE_NAME}:refresh`
+};
 const CACHE_TTL = 24 * 60 * 60; // 24 hours in seconds
+// Stale results are served at once and refreshed in the background, at most this often
+const REVALIDATIONS_PER_MINUTE = parseInt(process.env.REVALIDATIONS_PER_MINUTE || '30', 10);
+
+// Queues a refresh job for a stale result unless one is already pending or
+// this minute's revalidation budget is spent.
+//   KEYS = pending key, job key, refresh lane, budget counter
+//   ARGV = jobId, queued job, job record, budget
+const REVALIDATE_SCRIPT = `
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return 0
+end
+local count = redis.call('INCR', KEYS[4])
+if count == 1 then
+  redis.call('EXPIRE', KEYS[4], 60)
+end
+if count > tonumber(ARGV[4]) then
+  return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', 300)
+redis.call('SET', KEYS[2], ARGV[3], 'EX', 600)
+redis.call('LPUSH', KEYS[3], ARGV[2])
+return 1
+`;
 
 // Rate limiting
 const limiter = rateLimit({
@@ -52,18 +81,48 @@ async function initRedis() {
   }
 }
 
+/**
+ * Queue a background revalidation of a stale cached result on the refresh lane.
+ * Returns true if a job was queued.
+ */
+async function scheduleRevalidation(memberId) {
+  const jobId = uuidv4();
+  const job = {
+    jobId,
+    memberId,
+    createdAt: new Date().toISOString(),
+    status: 'pending',
+    revalidate: true
+  };
+  const minute = Math.floor(Date.now() / 60000);
+  const queued = await redisClient.eval(REVALIDATE_SCRIPT, {
+    keys: [`pending:${memberId}`, `job:${jobId}`, LANES.refresh, `revalidations:${minute}`],
+    arguments: [
+      jobId,
+      JSON.stringify(job),
+      JSON.stringify({ ...job, status: 'processing' }),
+      String(REVALIDATIONS_PER_MINUTE)
+    ]
+  });
+  return queued === 1;
+}
+
 /**
  * POST /api/check
  * Create a validation job or return cached result
  */
 app.post('/api/check', async (req, res) => {
   try {
-    const { memberId } = req.body;
+    const { memberId, lane = 'interactive' } = req.body;
     
     if (!memberId || !memberId.trim()) {
       return res.status(400).json({ error: 'memberId is required' });
     }
     
+    if (!Object.prototype.hasOwnProperty.call(LANES, lane)) {
+      return res.status(400).json({ error: `lane must be one of: ${Object.keys(LANES).join(', ')}` });
+    }
+    
     const normalizedId = memberId.trim();
     const cacheKey = `result:${normalizedId}`;
     
@@ -71,12 +130,23 @@ app.post('/api/check', async (req, res) => {
     if (redisClient) {
       try {
         const cached = await redisClient.get(cacheKey);
-        if (cached) {
-          console.log(`✅ Cache hit for ${normalizedId}`);
-          const result = JSON.parse(cached);
+        const result = cached ? JSON.parse(cached) : null;
+        const stale = Boolean(result && result.freshUntil) && Date.now() / 1000 >= result.freshUntil;
+        // Only valid memberships are served stale; a stale inactive or
+        // not-found answer may already be out of date, so it is looked up again
+        if (result && (!stale || result.outcome === 'valid')) {
+          if (stale) {
+            console.log(`♻️  Stale cache hit for ${normalizedId}`);
+            scheduleRevalidation(normalizedId)
+              .then((queued) => queued && console.log(`📋 Revalidation queued for ${normalizedId}`))
+              .catch((error) => console.error('Revalidation error:', error));
+          } else {
+            console.log(`✅ Cache hit for ${normalizedId}`);
+          }
           return res.json({
             jobId: null,
             status: 'completed',
+            stale,
             result: result
           });
         }
@@ -115,7 +185,7 @@ app.post('/api/check', async (req, res) => {
     // Add to queue
     if (redisClient) {
       try {
-        await redisClient.lPush(QUEUE_NAME, JSON.stringify(job));
+        await redisClient.lPush(LANES[lane], JSON.stringify(job));
         await redisClient.set(`pending:${normalizedId}`, jobId, { EX: 300 }); // 5 min TTL
         await redisClient.set(`job:${jobId}`, JSON.stringify({ ...job, status: 'processing' }), { EX: 600 }); // 10 min TTL
         console.log(`📋 Job created: ${jobId} for ${normalizedId}`);
@@ -242,9 +312,22 @@ app.get('/api/status/:jobId', async (req, res) => {
 app.get('/api/health', async (req, res) => {
   const redisStatus = redisClient && redisClient.isOpen ? 'connected' : 'disconnected';
   
+  // Jobs waiting per priority lane
+  let queues = null;
+  if (redisStatus === 'connected') {
+    try {
+      const names = Object.keys(LANES);
+      const depths = await Promise.all(names.map((name) => redisClient.lLen(LANES[name])));
+      queues = Object.fromEntries(names.map((name, i) => [name, depths[i]]));
+    } catch (error) {
+      console.error('Queue depth error:', error);
+    }
+  }
+  
   res.json({
     status: 'ok',
     redis: redisStatus,
+    queues,
     timestamp: new Date().toISOString()
   });
 });
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 IEEE Cookie Auto-Refresh Script
-Logs into IEEE SSO and updates .env file with new cookie
+Logs into IEEE SSO, publishes the new cookie to Redis and updates .env files
 """
 
 import os
@@ -24,8 +24,25 @@ PROJECT_ROOT = Path(__file__).parent.parent
 BACKEND_ENV = PROJECT_ROOT / 'backend' / '.env'
 WORKER_ENV = PROJECT_ROOT / 'worker' / '.env'
 
+# This script's own settings (credentials, REDIS_URL); exported variables win
+load_dotenv(Path(__file__).parent / '.env')
+
 IEEE_LOGIN_URL = "https://www.ieee.org/profile/public/createwebaccount/showSignIn.html"
 
+# Cookie distribution to workers (see worker/ieee_worker.py)
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
+COOKIE_KEY = 'ieee_cookie'
+COOKIE_CHANNEL = 'ieee_cookie_updates'
+
+# Bumps the version, stores the cookie and announces the version in one step
+#   KEYS[1] = cookie hash, ARGV[1] = cookie, ARGV[2] = timestamp, ARGV[3] = channel
+PUBLISH_COOKIE_SCRIPT = """
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'cookie', ARGV[1], 'updatedAt', ARGV[2])
+redis.call('PUBLISH', ARGV[3], version)
+return version
+"""
+
 
 def get_credentials():
     """Get IEEE credentials from environment or prompt."""
@@ -189,8 +206,8 @@ def login_and_extract_cookie(username: str, password: str) -> str:
             raise Exception(f"Login failed: {str(e)}")
 
 
-def update_env_file(env_path: Path, cookie_value: str):
-    """Update .env file with new cookie."""
+def update_env_file(env_path: Path, cookie_value: str, updated_at: str):
+    """Update .env file with new cookie and the time it was obtained."""
     # Ensure directory exists
     env_path.parent.mkdir(parents=True, exist_ok=True)
     
@@ -208,6 +225,8 @@ def update_env_file(env_path: Path, cookie_value: str):
     
     # Update cookie
     env_vars['IEEE_COOKIE'] = f'PA.Global_Websession={cookie_value}'
+    # Lets workers tell this cookie apart from an older one still in Redis
+    env_vars['IEEE_COOKIE_UPDATED_AT'] = updated_at
     
     # Write updated .env
     with open(env_path, 'w') as f:
@@ -219,6 +238,34 @@ def update_env_file(env_path: Path, cookie_value: str):
     logger.info(f"✓ Updated {env_path}")
 
 
+def publish_cookie(cookie_value: str, updated_at: str):
+    """
+    Store the cookie in Redis under a new version and notify workers.
+    
+    Args:
+        cookie_value: PA.Global_Websession cookie value
+        updated_at: UTC ISO time the cookie was obtained
+    
+    Returns:
+        The new cookie version, or None if Redis is unavailable
+    """
+    try:
+        import redis
+        
+        client = redis.from_url(REDIS_URL, decode_responses=True)
+        version = client.eval(
+            PUBLISH_COOKIE_SCRIPT, 1, COOKIE_KEY,
+            f'PA.Global_Websession={cookie_value}',
+            updated_at,
+            COOKIE_CHANNEL
+        )
+        logger.info(f"✓ Published cookie v{version} to {COOKIE_CHANNEL}")
+        return version
+    except Exception as e:
+        logger.warning(f"⚠️  Could not publish cookie to Redis: {e}")
+        return None
+
+
 def main():
     """Main entry point."""
     logger.info("=" * 60)
@@ -232,16 +279,23 @@ def main():
         # Login and extract cookie
         logger.info("\n🔄 Logging into IEEE...")
         cookie_value = login_and_extract_cookie(username, password)
+        # The same timestamp goes to Redis and .env so workers can tell which is newer
+        updated_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        
+        # Running workers pick the cookie up from Redis within milliseconds
+        logger.info("\n📡 Publishing cookie to workers...")
+        version = publish_cookie(cookie_value, updated_at)
         
-        # Update .env files
+        # .env files are kept for the backend and for worker restarts
         logger.info("\n📝 Updating .env files...")
-        update_env_file(BACKEND_ENV, cookie_value)
-        update_env_file(WORKER_ENV, cookie_value)
+        update_env_file(BACKEND_ENV, cookie_value, updated_at)
+        update_env_file(WORKER_ENV, cookie_value, updated_at)
         
         logger.info("\n✅ Cookie refresh completed successfully!")
         logger.info(f"Cookie value: {cookie_value[:50]}...")
-        logger.info("\n⚠️  Note: Worker processes need to be restarted to use new cookie")
-        logger.info("   Or wait for automatic reload (worker checks .env periodically)")
+        if version is None:
+            logger.info("\n⚠️  Note: Redis was unavailable, so workers will pick up the new cookie")
+            logger.info("   from .env when idle (or restart them to apply it now)")
         
         return 0
         
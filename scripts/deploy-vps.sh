@@ -46,6 +46,8 @@ $SCP_CMD -r backend/* "$VPS_HOST:$DEPLOY_DIR/backend/"
 # Upload worker
 echo "📤 Uploading worker..."
 $SCP_CMD -r worker/* "$VPS_HOST:$DEPLOY_DIR/worker/"
+# Shared modules used by the worker
+$SCP_CMD IEEE_Membership_Validater/membership_parser.py IEEE_Membership_Validater/member_ids.py IEEE_Membership_Validater/ttl_policy.py "$VPS_HOST:$DEPLOY_DIR/worker/"
 
 # Upload cookie refresh
 echo "📤 Uploading cookie refresh..."
@@ -86,7 +88,8 @@ echo "      - Start backend: cd $DEPLOY_DIR/backend && pm2 start ecosystem.confi
 echo "      - Create systemd service for worker (see deploy/systemd/worker.service)"
 echo "      - Create cron job for cookie refresh (see deploy/cron/refresh-cookie)"
 echo ""
-echo "   3. Configure Redis (if not already installed):"
+echo "   3. Configure Redis 6.2+ (if not already installed; the worker needs LMOVE/BLMOVE):"
+echo "      - Ubuntu 20.04/22.04 ship Redis 5.0/6.0: add the packages.redis.io apt repository first"
 echo "      - apt-get install redis-server"
 echo "      - systemctl enable redis-server"
 echo "      - systemctl start redis-server"
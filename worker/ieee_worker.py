@@ -6,14 +6,24 @@ Processes jobs from Redis queue and validates IEEE memberships
 
 import time
 import json
+import hashlib
 import os
 import sys
 import redis
 import requests
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-from typing import Dict, Optional
+from dotenv import find_dotenv, load_dotenv
+from typing import Dict, List, Tuple
 import logging
+import threading
+
+# The page parser and ID normalization are shared with the bulk validator;
+# deployments copy them next to this file, local checkouts pick them up from
+# the sibling directory.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'IEEE_Membership_Validater'))
+from member_ids import normalize_member_id
+from bs4 import BeautifulSoup
+from membership_parser import DEFAULT_PARSER, MembershipExtractor
+from ttl_policy import TTLPolicy
 
 # Setup logging
 logging.basicConfig(
@@ -23,18 +33,126 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Load environment variables
+ENV_FILE = find_dotenv()
 load_dotenv()
 
 # Configuration
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
-QUEUE_NAME = 'ieee_validation_queue'
+MIN_REDIS_VERSION = (6, 2)  # LMOVE/BLMOVE for the reliable queue
+QUEUE_NAME = 'ieee_validation_queue'  # Interactive lane, fed by the backend
 IEEE_COOKIE = os.getenv('IEEE_COOKIE', '')
-REQUEST_DELAY = 0.7  # 0.7 seconds between requests
+IEEE_COOKIE_UPDATED_AT = os.getenv('IEEE_COOKIE_UPDATED_AT', '')  # UTC ISO time, written with the cookie
+REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', 0.7))  # Seconds between requests, across all workers
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', 1))  # Requests allowed back to back after idle time
+RATE_LIMIT_ACCOUNT = os.getenv('RATE_LIMIT_ACCOUNT', '')  # Bucket name; defaults to a hash of the cookie
 WORKER_ID = os.getenv('WORKER_ID', f'worker-{os.getpid()}')
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', 5))  # Jobs taken per dequeue
+JOB_TTL = 600  # 10 minutes, as set by the backend
+VISIBILITY_TIMEOUT = int(os.getenv('VISIBILITY_TIMEOUT', 60))  # Seconds without a heartbeat before jobs are re-queued
+WORKERS_KEY = 'ieee_workers'  # Set of worker IDs that may hold in-flight jobs
+BREAKER_PROBE_INTERVAL = int(os.getenv('BREAKER_PROBE_INTERVAL', 60))  # Seconds before re-probing an unchanged cookie
+BREAKER_MAX_ATTEMPTS = 3  # Distinct cookies one member may expire on before its jobs are failed
+COOKIE_KEY = 'ieee_cookie'  # Hash: cookie, version, updatedAt (written by refresh_cookie.py)
+COOKIE_CHANNEL = 'ieee_cookie_updates'  # Publishes the new version on every refresh
+
+# Priority lanes as (name, queue), highest priority first
+LANES = [
+    ('interactive', QUEUE_NAME),
+    ('bulk', f'{QUEUE_NAME}:bulk'),
+    ('refresh', f'{QUEUE_NAME}:refresh'),
+]
+LANE_QUEUES = dict(LANES)
+# 'strict' always drains higher lanes first; 'weighted' shares dequeues by LANE_WEIGHTS
+LANE_POLICY = os.getenv('LANE_POLICY', 'strict')
+LANE_WEIGHTS = {
+    name: int(weight)
+    for name, weight in (item.split('=') for item in os.getenv('LANE_WEIGHTS', 'interactive=8,bulk=2,refresh=1').split(','))
+}
+LANE_POLL = 1  # Seconds to block on the interactive lane before re-checking the others
+RESULT_TTL = 24 * 60 * 60  # Seconds until a result is stale, when no TTL rule matches
+# Stale-after lifetimes by membership status and grade (RESULT_TTL_RULES), jittered by RESULT_TTL_JITTER
+TTL_POLICY = TTLPolicy.from_env()
+STALE_TTL = int(os.getenv('STALE_TTL', 7 * 24 * 60 * 60))  # Seconds a stale result may still be served
+NEGATIVE_RESULT_TTL = int(os.getenv('NEGATIVE_RESULT_TTL', 15 * 60))  # 'not_found' answers, never served stale
+
+# Moves the first job found in the given lanes into its processing list.
+#   KEYS = queue1, processing1, queue2, processing2, ... in lane order
+#   Returns {lane position (1-based), payload} or nil
+TAKE_JOB_SCRIPT = '''
+for i = 1, #KEYS, 2 do
+    local payload = redis.call('LMOVE', KEYS[i], KEYS[i + 1], 'LEFT', 'RIGHT')
+    if payload then
+        return {(i + 1) / 2, payload}
+    end
+end
+return nil
+'''
+
+# Lookup outcomes. valid/inactive/not_found are definitive answers and are
+# cached; upstream_error and session_expired are transient and never cached.
+OUTCOME_VALID = 'valid'
+OUTCOME_INACTIVE = 'inactive'
+OUTCOME_NOT_FOUND = 'not_found'
+OUTCOME_UPSTREAM_ERROR = 'upstream_error'
+OUTCOME_SESSION_EXPIRED = 'session_expired'
+
+# Text shown in the result area when IEEE has no membership for the submitted ID
+NOT_FOUND_MARKERS = ('no record', 'not found', 'could not be found', 'no member', 'no results')
 
 # IEEE API endpoint
 IEEE_VALIDATOR_URL = 'https://services24.ieee.org/membership-validator.html'
 
+# Token bucket shared by every worker on every node. Reserves the next
+# request start for the caller and returns how long it must wait. Uses the
+# Redis clock so workers on different hosts agree on time.
+#   KEYS[1] = bucket key, ARGV[1] = seconds per request, ARGV[2] = burst
+RATE_LIMIT_SCRIPT = '''
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local next_start = tonumber(redis.call('GET', KEYS[1])) or now
+local start = math.max(next_start, now - (burst - 1) * interval)
+local ttl = math.ceil((start + interval - now) * 1000) + 1000
+redis.call('SET', KEYS[1], tostring(start + interval), 'PX', ttl)
+return tostring(start - now)
+'''
+
+
+def result_ttls(result: Dict) -> Tuple[int, int]:
+    """
+    Cache lifetimes for a successful lookup in result:{memberId}.
+    
+    Returns:
+        (soft, hard) seconds. After the soft TTL the backend still serves a
+        valid result but queues a revalidation; after the hard TTL the key
+        expires. Only valid results get a stale window: an inactive or
+        not-found answer may change any day and must not be acted on late.
+    """
+    if result.get('outcome') == OUTCOME_NOT_FOUND:
+        return NEGATIVE_RESULT_TTL, NEGATIVE_RESULT_TTL
+    soft_ttl = TTL_POLICY.ttl(result.get('membershipStatus'), result.get('memberGrade'), RESULT_TTL)
+    if result.get('outcome') != OUTCOME_VALID:
+        return soft_ttl, soft_ttl
+    return soft_ttl, soft_ttl + STALE_TTL
+
+
+def env_file_time() -> str:
+    """When .env was last modified, as a UTC ISO time ('' without a .env)."""
+    if not ENV_FILE or not os.path.exists(ENV_FILE):
+        return ''
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(os.path.getmtime(ENV_FILE)))
+
+
+def processing_key(worker_id: str, lane: str) -> str:
+    """List holding the jobs a worker has taken from a lane but not finished."""
+    return f'processing:{worker_id}:{lane}'
+
+
+def heartbeat_key(worker_id: str) -> str:
+    """Key that exists while a worker is alive."""
+    return f'worker:{worker_id}:heartbeat'
+
 
 class IEEEWorker:
     """Worker that processes IEEE validation jobs from Redis queue."""
@@ -43,7 +161,28 @@ class IEEEWorker:
         self.redis_client = None
         self.session = requests.Session()
         self.last_request_time = 0
+        self.rate_limit_script = None
+        self.in_flight: Dict[str, Tuple[str, str]] = {}  # jobId -> (lane, raw payload) in our processing lists
+        self.take_job_script = None
+        self.lane_credit = {name: 0 for name, _ in LANES}
+        self.last_reap = 0
+        # Circuit breaker: 'closed' (normal), 'open' (session expired, not
+        # dequeuing) or 'half_open' (one probe job at a time)
+        self.breaker = 'closed'
+        self.breaker_opened_at = 0
+        self.breaker_cookie = None
+        self.expiry_cookies: Dict[str, set] = {}  # member -> distinct cookies it expired on while probing
         self.current_cookie = IEEE_COOKIE  # Track current cookie value
+        self.env_cookie = IEEE_COOKIE  # Last cookie seen in .env
+        self.env_updated_at = IEEE_COOKIE_UPDATED_AT  # Last IEEE_COOKIE_UPDATED_AT seen in .env
+        # When the cookie in use was obtained; a hand-written cookie without a
+        # time dates from the last edit of .env
+        self.cookie_updated_at = IEEE_COOKIE_UPDATED_AT or env_file_time()
+        self.cookie_version = 0  # Version of the published cookie in use
+        self.cookie_update = None  # (version, cookie, updatedAt) staged by the watcher thread
+        self.cookie_lock = threading.Lock()
+        # Worker results never included the trailing whole-document society scan
+        self.extractor = MembershipExtractor(deep_society_scan=False, collect_text=True)
         self.setup_session()
         
     def setup_session(self):
@@ -74,121 +213,89 @@ class IEEEWorker:
         try:
             self.redis_client = redis.from_url(REDIS_URL, decode_responses=True)
             self.redis_client.ping()
+            server_version = self.redis_client.info('server').get('redis_version', '0')
+            if tuple(int(part) for part in server_version.split('.')[:2]) < MIN_REDIS_VERSION:
+                logger.error(f'❌ Redis {server_version} is too old: the worker needs Redis '
+                             f'{".".join(map(str, MIN_REDIS_VERSION))} or newer (LMOVE/BLMOVE)')
+                return False
+            self.rate_limit_script = self.redis_client.register_script(RATE_LIMIT_SCRIPT)
+            self.take_job_script = self.redis_client.register_script(TAKE_JOB_SCRIPT)
             logger.info(f'✅ Redis connected: {REDIS_URL}')
             return True
         except Exception as e:
             logger.error(f'❌ Redis connection failed: {e}')
             return False
     
+    def rate_limit_key(self) -> str:
+        """Redis key of the token bucket for the current account/cookie."""
+        account = RATE_LIMIT_ACCOUNT
+        if not account:
+            account = hashlib.sha256((self.current_cookie or '').encode()).hexdigest()[:16]
+        return f'ratelimit:ieee:{account}'
+    
     def rate_limit(self):
-        """Enforce 0.7s delay between requests."""
+        """Wait for this request's slot in the budget shared by all workers."""
+        if self.rate_limit_script:
+            try:
+                wait = float(self.rate_limit_script(
+                    keys=[self.rate_limit_key()],
+                    args=[REQUEST_DELAY, RATE_LIMIT_BURST]
+                ))
+                if wait > 0:
+                    time.sleep(wait)
+                self.last_request_time = time.time()
+                return
+            except redis.exceptions.RedisError as e:
+                logger.warning(f'⚠️  Shared rate limiter unavailable, pacing locally: {e}')
+        
+        # Per-process fallback: REQUEST_DELAY between this worker's requests
         elapsed = time.time() - self.last_request_time
         if elapsed < REQUEST_DELAY:
             sleep_time = REQUEST_DELAY - elapsed
             time.sleep(sleep_time)
         self.last_request_time = time.time()
     
-    def check_session_expiry(self, soup: BeautifulSoup, status_code: int) -> bool:
+    def check_session_expiry(self, page: Dict, status_code: int) -> bool:
         """Check if session has expired."""
         # Check for session expiry indicators
         if status_code == 401 or status_code == 403:
             return True
         
-        page_text = soup.get_text().lower()
+        page_text = page['page_text'].lower()
         if 'sign in' in page_text or 'login' in page_text or 'unauthorized' in page_text:
             return True
         
-        # Check for membership validation status section
-        status_section = soup.find(string=lambda text: text and 'Membership validation status' in text)
-        return status_section is None
-    
-    def extract_field_value(self, soup: BeautifulSoup, label_text: str) -> Optional[str]:
-        """Extract field value by label text."""
-        label_element = soup.find(string=lambda text: text and label_text in text)
-        if not label_element:
-            return None
-        
-        parent = label_element.find_parent()
-        if not parent:
-            return None
-        
-        # Check for sibling span elements
-        next_sibling = parent.find_next_sibling()
-        if next_sibling:
-            if next_sibling.name == 'span':
-                value = next_sibling.get_text(strip=True)
-                # Handle name initials (multiple spans)
-                if label_text == 'First and last name initials':
-                    spans = [next_sibling]
-                    current = next_sibling.find_next_sibling()
-                    while current and current.name == 'span':
-                        spans.append(current)
-                        current = current.find_next_sibling()
-                    if len(spans) > 1:
-                        values = [s.get_text(strip=True) for s in spans]
-                        return '. '.join(values) + '.' if values else None
-                if value:
-                    return value
-            else:
-                value = next_sibling.get_text(strip=True)
-                if value and value not in label_text:
-                    return value
-        
-        # Try extracting from same element (after colon)
-        full_text = parent.get_text(separator=' ', strip=True)
-        if ':' in full_text:
-            parts = full_text.split(':', 1)
-            if len(parts) > 1:
-                value = parts[1].strip()
-                if value:
-                    return value
-        
-        # Try next siblings
-        for sibling in parent.find_next_siblings():
-            text = sibling.get_text(strip=True)
-            if text and text not in label_text:
-                return text
-        
-        return None
-    
-    def extract_society_memberships(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract society memberships."""
-        label_element = soup.find(string=lambda text: text and 'Society membership' in text)
-        if not label_element:
-            return None
-        
-        parent = label_element.find_parent()
-        if not parent:
-            return None
-        
-        societies = []
-        
-        # Try to find list (ul/ol) after label
-        list_elem = parent.find_next(['ul', 'ol'])
-        if list_elem:
-            for li in list_elem.find_all('li'):
-                text = li.get_text(strip=True)
-                if text and 'IEEE' in text:
-                    societies.append(text)
-            if societies:
-                return ', '.join(societies)
-        
-        # Check siblings
-        for sibling in parent.find_next_siblings(['div', 'span', 'p', 'ul', 'ol']):
-            if sibling.name in ['ul', 'ol']:
-                for li in sibling.find_all('li'):
-                    text = li.get_text(strip=True)
-                    if text and 'IEEE' in text:
-                        societies.append(text)
-            else:
-                text = sibling.get_text(strip=True)
-                if text and 'IEEE' in text and 'Society' in text:
-                    societies.append(text)
+        # An authenticated "no such member" page is an answer, not an expiry
+        if self.is_not_found(page):
+            return False
         
-        if societies:
-            return ', '.join(societies)
+        # Check for membership validation status section
+        return not page['status_section_found']
+    
+    def result_text(self, soup: BeautifulSoup) -> str:
+        """
+        Return the text of the validator's result area.
         
-        return None
+        The area is the element holding the validator form (the one with
+        the customerId field), which only an authenticated validator page
+        has. Sign-in and error pages have no such area, so their chrome can
+        never be read as a "no such member" answer.
+        """
+        field = soup.find('input', attrs={'name': 'customerId'})
+        form = field.find_parent('form') if field else None
+        if form is None:
+            return ''
+        container = form.parent or form
+        return container.get_text(' ')
+    
+    def is_not_found(self, page: Dict) -> bool:
+        """Check if IEEE answered that the ID has no membership."""
+        if page['membership_status']:
+            return False
+        if page['status_section_found']:
+            return True
+        result_text = page.get('result_text', '').lower()
+        return any(marker in result_text for marker in NOT_FOUND_MARKERS)
     
     def validate_member(self, member_id: str) -> Dict:
         """Validate a single IEEE member."""
@@ -205,12 +312,25 @@ class IEEEWorker:
                 timeout=30
             )
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # IEEE-side failures are transient, whatever the page says
+            if response.status_code >= 500 or response.status_code == 429:
+                logger.error(f'Upstream error for {member_id}: HTTP {response.status_code}')
+                return {
+                    'success': False,
+                    'outcome': OUTCOME_UPSTREAM_ERROR,
+                    'error': f'Upstream error: HTTP {response.status_code}',
+                    'session_expired': False
+                }
+            
+            soup = BeautifulSoup(response.text, DEFAULT_PARSER)
+            page = self.extractor.extract(soup)
+            page['result_text'] = self.result_text(soup)
             
             # Check for session expiry
-            if self.check_session_expiry(soup, response.status_code):
+            if self.check_session_expiry(page, response.status_code):
                 return {
                     'success': False,
+                    'outcome': OUTCOME_SESSION_EXPIRED,
                     'error': 'Session expired: Cookie needs refresh',
                     'session_expired': True
                 }
@@ -219,17 +339,22 @@ class IEEEWorker:
             result = {
                 'success': True,
                 'memberId': member_id,
-                'nameInitials': self.extract_field_value(soup, 'First and last name initials'),
-                'membershipStatus': self.extract_field_value(soup, 'Membership status'),
-                'memberGrade': self.extract_field_value(soup, 'IEEE member grade'),
-                'standardsAssociationMember': self.extract_field_value(soup, 'Standards Association Member'),
-                'societyMemberships': self.extract_society_memberships(soup),
+                'nameInitials': page['name_initials'],
+                'membershipStatus': page['membership_status'],
+                'memberGrade': page['member_grade'],
+                'standardsAssociationMember': page['standards_association_member'],
+                'societyMemberships': page['society_memberships'],
                 'isValid': False
             }
             
             # Determine if membership is valid (Active status)
             if result['membershipStatus'] and 'Active' in result['membershipStatus']:
                 result['isValid'] = True
+                result['outcome'] = OUTCOME_VALID
+            elif self.is_not_found(page):
+                result['outcome'] = OUTCOME_NOT_FOUND
+            else:
+                result['outcome'] = OUTCOME_INACTIVE
             
             return result
             
@@ -237,6 +362,7 @@ class IEEEWorker:
             logger.error(f'Request error for {member_id}: {e}')
             return {
                 'success': False,
+                'outcome': OUTCOME_UPSTREAM_ERROR,
                 'error': f'Request failed: {str(e)}',
                 'session_expired': False
             }
@@ -244,103 +370,413 @@ class IEEEWorker:
             logger.error(f'Validation error for {member_id}: {e}')
             return {
                 'success': False,
+                'outcome': OUTCOME_UPSTREAM_ERROR,
                 'error': f'Validation failed: {str(e)}',
                 'session_expired': False
             }
     
-    def process_job(self, job_data: Dict) -> Dict:
-        """Process a single validation job."""
-        job_id = job_data.get('jobId')
-        member_id = job_data.get('memberId')
+    def set_job(self, pipe, job_data: Dict, **fields):
+        """Queue a job status update on a Redis pipeline."""
+        pipe.set(
+            f'job:{job_data.get("jobId")}',
+            json.dumps({**job_data, **fields}),
+            ex=JOB_TTL
+        )
+    
+    def ack(self, pipe, job_data: Dict):
+        """Queue removal of a finished job from our processing list."""
+        entry = self.in_flight.get(job_data.get('jobId'))
+        if entry is not None:
+            lane, payload = entry
+            pipe.lrem(processing_key(WORKER_ID, lane), 1, payload)
+    
+    def forget(self, jobs: List[Dict]):
+        """Drop jobs whose acknowledgement has been written."""
+        for job_data in jobs:
+            self.in_flight.pop(job_data.get('jobId'), None)
+    
+    def release_in_flight(self):
+        """Put jobs this worker could not finish back at the head of the queue."""
+        if not self.in_flight:
+            return
+        pipe = self.redis_client.pipeline()
+        # Pushed last-first so the oldest job ends up at the head of its lane
+        for lane, payload in reversed(list(self.in_flight.values())):
+            pipe.lrem(processing_key(WORKER_ID, lane), 1, payload)
+            pipe.lpush(LANE_QUEUES[lane], payload)
+        pipe.execute()
+        logger.warning(f'♻️  Re-queued {len(self.in_flight)} unfinished jobs')
+        self.in_flight.clear()
+    
+    def heartbeat(self):
+        """Refresh this worker's heartbeat until the process exits."""
+        while True:
+            try:
+                self.redis_client.set(heartbeat_key(WORKER_ID), int(time.time()), ex=VISIBILITY_TIMEOUT)
+            except Exception as e:
+                logger.error(f'Heartbeat failed: {e}')
+            time.sleep(VISIBILITY_TIMEOUT / 3)
+    
+    def requeue_processing(self, worker_id: str) -> int:
+        """Move a worker's unfinished jobs back to the head of their lanes."""
+        moved = 0
+        for lane, queue in LANES:
+            # Moving from the tail keeps the original order at the queue head
+            while self.redis_client.lmove(processing_key(worker_id, lane), queue, 'RIGHT', 'LEFT'):
+                moved += 1
+        return moved
+    
+    def lane_depths(self) -> Dict[str, int]:
+        """Return the number of queued jobs per lane."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for _, queue in LANES:
+            pipe.llen(queue)
+        return {name: depth for (name, _), depth in zip(LANES, pipe.execute())}
+    
+    def report_lane_depths(self):
+        """Log queue depth per lane when anything is waiting."""
+        depths = self.lane_depths()
+        if any(depths.values()):
+            logger.info('📊 Queue depth: ' + ', '.join(f'{name}={depth}' for name, depth in depths.items()))
+    
+    def reap_abandoned(self):
+        """Re-queue jobs held by workers whose heartbeat has expired."""
+        self.last_reap = time.time()
+        for worker_id in self.redis_client.smembers(WORKERS_KEY):
+            if worker_id == WORKER_ID or self.redis_client.exists(heartbeat_key(worker_id)):
+                continue
+            moved = self.requeue_processing(worker_id)
+            self.redis_client.srem(WORKERS_KEY, worker_id)
+            if moved:
+                logger.warning(f'♻️  Re-queued {moved} jobs abandoned by {worker_id}')
+    
+    def open_breaker(self):
+        """Stop dequeuing until a new cookie arrives or the probe interval passes."""
+        if self.breaker != 'open':
+            logger.warning('🔴 Circuit open: session expired, pausing until the cookie is refreshed')
+        self.breaker = 'open'
+        self.breaker_opened_at = time.time()
+        self.breaker_cookie = self.current_cookie
+    
+    def close_breaker(self):
+        """Resume normal batch processing."""
+        if self.breaker != 'closed':
+            logger.info('🟢 Circuit closed: session is valid again')
+            self.expiry_cookies.clear()
+        self.breaker = 'closed'
+    
+    def breaker_allows(self) -> bool:
+        """Return True if jobs may be dequeued, moving an open breaker to half-open when due."""
+        if self.breaker != 'open':
+            return True
+        cookie_changed = self.current_cookie != self.breaker_cookie
+        if cookie_changed or time.time() - self.breaker_opened_at >= BREAKER_PROBE_INTERVAL:
+            self.breaker = 'half_open'
+            reason = 'new cookie' if cookie_changed else 'probe interval elapsed'
+            logger.info(f'🟡 Circuit half-open ({reason}): probing with one job')
+            return True
+        return False
+    
+    def reload_cookie(self):
+        """Fallback: swap in the .env cookie when the file's value changes."""
+        load_dotenv(override=True)
+        new_cookie = os.getenv('IEEE_COOKIE', '')
+        env_updated_at = os.getenv('IEEE_COOKIE_UPDATED_AT', '')
+        # Compared with the last .env value and the time of the cookie in
+        # use, so an older file cannot replace a newer cookie from Redis
+        if new_cookie and new_cookie != self.env_cookie:
+            updated_at = env_updated_at
+            # A hand edit leaves the time empty or as written for the previous
+            # cookie, so the edit itself is when this cookie was obtained
+            if not updated_at or updated_at == self.env_updated_at:
+                updated_at = env_file_time()
+            self.env_cookie = new_cookie
+            self.env_updated_at = env_updated_at
+            if new_cookie != self.current_cookie and updated_at >= self.cookie_updated_at:
+                logger.info('🔄 Cookie updated in .env, reloading session...')
+                self.current_cookie = new_cookie
+                self.cookie_updated_at = updated_at
+                self.setup_session()
+    
+    def fetch_published_cookie(self):
+        """Stage the cookie stored in Redis if it is newer than the one in use."""
+        cookie, version, updated_at = self.redis_client.hmget(COOKIE_KEY, 'cookie', 'version', 'updatedAt')
+        if not cookie or not version:
+            return
+        with self.cookie_lock:
+            staged = self.cookie_update[0] if self.cookie_update else self.cookie_version
+            if int(version) > staged:
+                self.cookie_update = (int(version), cookie, updated_at or '')
+    
+    def watch_cookie(self):
+        """Background thread: stage every cookie published on COOKIE_CHANNEL."""
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(COOKIE_CHANNEL)
+                # Pick up anything published while we were not subscribed
+                self.fetch_published_cookie()
+                for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self.fetch_published_cookie()
+            except Exception as e:
+                logger.error(f'Cookie watcher error: {e}')
+                time.sleep(5)
+    
+    def apply_cookie_update(self):
+        """Swap a staged cookie into the session; called between jobs."""
+        with self.cookie_lock:
+            update, self.cookie_update = self.cookie_update, None
+        if not update or update[0] <= self.cookie_version:
+            return
+        version, cookie, updated_at = update
+        self.cookie_version = version
+        # A cookie written to .env while Redis was down is newer than the
+        # last published one; keep it
+        if updated_at < self.cookie_updated_at:
+            logger.info(f'⏭️  Cookie v{version} in Redis is older than the one in use, ignoring it')
+            return
+        self.current_cookie = cookie
+        self.cookie_updated_at = updated_at
+        self.setup_session()
+        logger.info(f'🔄 Cookie v{self.cookie_version} applied from Redis')
+    
+    def lane_order(self) -> List[Tuple[str, str]]:
+        """
+        Return the lanes in the order to try them for the next dequeue.
         
-        logger.info(f'🔄 Processing job {job_id} for member {member_id}')
+        Strict policy always uses priority order. Weighted policy puts the
+        lane chosen by smooth weighted round-robin first, then falls back
+        to the others in priority order when it is empty.
+        """
+        if LANE_POLICY != 'weighted':
+            return LANES
+        for name, _ in LANES:
+            self.lane_credit[name] += LANE_WEIGHTS.get(name, 1)
+        first = max(LANES, key=lambda lane: self.lane_credit[lane[0]])
+        self.lane_credit[first[0]] -= sum(LANE_WEIGHTS.get(name, 1) for name, _ in LANES)
+        return [first] + [lane for lane in LANES if lane is not first]
+    
+    def take_job(self, timeout: float) -> Tuple[str, str]:
+        """
+        Move the next job into our processing list, waiting up to `timeout`.
         
-        # Update job status to processing
-        if self.redis_client:
+        Every lane is checked atomically in one round trip. While all are
+        empty the worker blocks on the interactive lane in LANE_POLL steps,
+        so interactive jobs are picked up immediately and other lanes
+        within a second.
+        
+        Returns:
+            (lane, payload), or (None, None) on timeout
+        """
+        deadline = time.time() + timeout
+        while True:
+            lanes = self.lane_order()
+            keys = []
+            for lane, queue in lanes:
+                keys += [queue, processing_key(WORKER_ID, lane)]
+            taken = self.take_job_script(keys=keys)
+            if taken:
+                return lanes[int(taken[0]) - 1][0], taken[1]
+            
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None, None
+            lane, queue = LANES[0]
+            payload = self.redis_client.blmove(queue, processing_key(WORKER_ID, lane),
+                                               min(LANE_POLL, remaining), 'LEFT', 'RIGHT')
+            if payload:
+                return lane, payload
+    
+    def fetch_jobs(self, limit: int = BATCH_SIZE) -> List[Dict]:
+        """
+        Wait for the next job, then take up to `limit` - 1 more from its lane.
+        
+        Jobs are moved (not popped) into this worker's processing lists, so
+        they survive a crash until they are acknowledged. The extra LMOVEs
+        are pipelined, so a batch costs two round trips. Returns an empty
+        list when nothing arrives within 5 seconds.
+        """
+        lane, payload = self.take_job(timeout=5)
+        if not payload:
+            return []
+        
+        queue = LANE_QUEUES[lane]
+        processing = processing_key(WORKER_ID, lane)
+        payloads = [payload]
+        if limit > 1:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for _ in range(limit - 1):
+                pipe.lmove(queue, processing, 'LEFT', 'RIGHT')
+            payloads.extend(payload for payload in pipe.execute() if payload)
+        
+        jobs = []
+        for payload in payloads:
             try:
-                self.redis_client.set(
-                    f'job:{job_id}',
-                    json.dumps({**job_data, 'status': 'processing', 'worker': WORKER_ID}),
-                    ex=600
-                )
-            except Exception as e:
-                logger.error(f'Failed to update job status: {e}')
+                job_data = json.loads(payload)
+            except json.JSONDecodeError:
+                logger.error(f'❌ Dropping malformed job: {payload[:200]}')
+                self.redis_client.lrem(processing, 1, payload)
+                continue
+            self.in_flight[job_data.get('jobId')] = (lane, payload)
+            jobs.append(job_data)
+        if jobs and lane != LANES[0][0]:
+            logger.info(f'📥 Took {len(jobs)} jobs from the {lane} lane')
+        return jobs
+    
+    def process_batch(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Process a batch of validation jobs.
         
-        # Validate member
-        result = self.validate_member(member_id)
+        Jobs for the same member are validated once. Each member's status,
+        result and pending changes are written in one MULTI/EXEC. A session
+        expiry opens the circuit breaker and leaves the unfinished jobs in
+        flight for re-queueing.
         
-        if result.get('session_expired'):
-            logger.warning('⚠️  Session expired - worker should pause for cookie refresh')
-            # Mark job as failed with special flag
-            if self.redis_client:
-                try:
-                    self.redis_client.set(
-                        f'job:{job_id}',
-                        json.dumps({
-                            **job_data,
-                            'status': 'failed',
-                            'error': 'Session expired',
-                            'session_expired': True
-                        }),
-                        ex=600
-                    )
-                except Exception as e:
-                    logger.error(f'Failed to update job status: {e}')
-            return result
+        Returns:
+            One result per job, in job order
+        """
+        results: List[Dict] = [None] * len(jobs)
+        groups: Dict[str, List[int]] = {}
+        statuses = [None] * len(jobs)
+        acked: List[Dict] = []
         
-        if not result.get('success'):
-            # Mark job as failed
-            if self.redis_client:
-                try:
-                    self.redis_client.set(
-                        f'job:{job_id}',
-                        json.dumps({
-                            **job_data,
-                            'status': 'failed',
-                            'error': result.get('error', 'Validation failed')
-                        }),
-                        ex=600
-                    )
-                    # Remove from pending
-                    self.redis_client.delete(f'pending:{member_id}')
-                except Exception as e:
-                    logger.error(f'Failed to update job status: {e}')
-            return result
+        if self.redis_client:
+            # Re-queued jobs may have been finished before their worker died
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for job_data in jobs:
+                    pipe.get(f'job:{job_data.get("jobId")}')
+                statuses = [json.loads(job).get('status') if job else None for job in pipe.execute()]
+            except Exception as e:
+                logger.error(f'Failed to read job status: {e}')
+            pipe = self.redis_client.pipeline(transaction=False)
         
-        # Success - cache result and update job
-        result['jobId'] = job_id
-        result['completedAt'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        for index, job_data in enumerate(jobs):
+            job_id = job_data.get('jobId')
+            member_id = job_data.get('memberId')
+            
+            if statuses[index] in ('completed', 'failed'):
+                logger.info(f'⏭️  Job {job_id} already {statuses[index]}, skipping')
+                results[index] = {'success': statuses[index] == 'completed', 'skipped': True}
+                if self.redis_client:
+                    self.ack(pipe, job_data)
+                    acked.append(job_data)
+                continue
+            
+            logger.info(f'🔄 Processing job {job_id} for member {member_id}')
+            
+            # Reject malformed IDs locally; Redis keys keep the ID as submitted
+            canonical_id, id_error = normalize_member_id(member_id)
+            if id_error:
+                logger.warning(f'⚠️  Rejected job {job_id}: {id_error}')
+                results[index] = {'success': False, 'outcome': OUTCOME_NOT_FOUND,
+                                  'error': id_error, 'session_expired': False}
+                if self.redis_client:
+                    self.set_job(pipe, job_data, status='failed', error=id_error)
+                    pipe.delete(f'pending:{member_id}')
+                    self.ack(pipe, job_data)
+                    acked.append(job_data)
+                continue
+            
+            groups.setdefault(canonical_id, []).append(index)
+            if self.redis_client:
+                self.set_job(pipe, job_data, status='processing', worker=WORKER_ID)
         
+        # One round trip for every skip, rejection and 'processing' marker
         if self.redis_client:
             try:
-                # Cache result for 24 hours
-                cache_key = f'result:{member_id}'
-                self.redis_client.set(
-                    cache_key,
-                    json.dumps(result),
-                    ex=24 * 60 * 60  # 24 hours
-                )
-                
-                # Update job status
-                self.redis_client.set(
-                    f'job:{job_id}',
-                    json.dumps({
-                        **job_data,
-                        'status': 'completed',
-                        'completedAt': result['completedAt']
-                    }),
-                    ex=600
-                )
-                
-                # Remove from pending
-                self.redis_client.delete(f'pending:{member_id}')
-                
-                logger.info(f'✅ Job {job_id} completed successfully')
-                
+                pipe.execute()
+                self.forget(acked)
             except Exception as e:
-                logger.error(f'Failed to cache result: {e}')
+                logger.error(f'Failed to update job status: {e}')
         
-        return result
+        if len(jobs) > 1:
+            logger.info(f'📦 Batch of {len(jobs)} jobs, {len(groups)} unique members')
+        
+        for canonical_id, indices in groups.items():
+            self.apply_cookie_update()
+            result = self.validate_member(canonical_id)
+            if result.get('session_expired'):
+                self.open_breaker()
+                group = [jobs[index] for index in indices]
+                # Re-probing with the cookie that opened the breaker is not a
+                # new attempt; only an expiry on a different cookie counts
+                cookies = self.expiry_cookies.setdefault(canonical_id, set())
+                cookies.add(self.current_cookie)
+                attempts = len(cookies)
+                if attempts >= BREAKER_MAX_ATTEMPTS:
+                    # Keeps one member whose page always looks expired from
+                    # stalling the queue across cookie refreshes
+                    logger.warning(f'⚠️  Failing {canonical_id} after {attempts} session expiries')
+                    self.finish_jobs(group, result)
+                # This and the remaining jobs stay in flight and are put
+                # back at the head of the queue instead of failing
+                for index in indices:
+                    results[index] = result
+                break
+            self.close_breaker()
+            group = [jobs[index] for index in indices]
+            for index, job_result in zip(indices, self.finish_jobs(group, result)):
+                results[index] = job_result
+        
+        return results
+    
+    def finish_jobs(self, group: List[Dict], result: Dict) -> List[Dict]:
+        """
+        Record one validation result for every job that asked for it.
+        
+        All writes, including the acknowledgements that take the jobs off
+        our processing list, go out in a single MULTI/EXEC.
+        
+        Returns:
+            The result as seen by each job
+        """
+        if result.get('success'):
+            completed_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            soft_ttl, hard_ttl = result_ttls(result)
+            fresh_until = int(time.time()) + soft_ttl
+            job_results = [
+                {**result, 'jobId': job_data.get('jobId'), 'completedAt': completed_at,
+                 'freshUntil': fresh_until}
+                for job_data in group
+            ]
+        else:
+            job_results = [result] * len(group)
+        
+        if not self.redis_client:
+            return job_results
+        
+        try:
+            pipe = self.redis_client.pipeline()
+            for job_data, job_result in zip(group, job_results):
+                member_id = job_data.get('memberId')
+                if result.get('success'):
+                    # Definitive answers are cached; 'not found' only briefly.
+                    # Stale results stay until the hard TTL so the backend can
+                    # serve them while a revalidation runs.
+                    pipe.set(f'result:{member_id}', json.dumps(job_result), ex=hard_ttl)
+                    self.set_job(pipe, job_data, status='completed',
+                                 completedAt=job_result['completedAt'])
+                else:
+                    self.set_job(pipe, job_data, status='failed',
+                                 error=result.get('error', 'Validation failed'))
+                pipe.delete(f'pending:{member_id}')
+                self.ack(pipe, job_data)
+            pipe.execute()
+            self.forget(group)
+            
+            if result.get('success'):
+                for job_data in group:
+                    logger.info(f'✅ Job {job_data.get("jobId")} completed successfully')
+        except Exception as e:
+            logger.error(f'Failed to update job status: {e}')
+        
+        return job_results
+    
+    def process_job(self, job_data: Dict) -> Dict:
+        """Process a single validation job."""
+        return self.process_batch([job_data])[0]
     
     def run(self):
         """Main worker loop."""
@@ -350,27 +786,47 @@ class IEEEWorker:
             logger.error('❌ Cannot start worker: Redis connection failed')
             sys.exit(1)
         
+        # Register for the reaper and recover jobs from a previous run with our ID
+        self.redis_client.set(heartbeat_key(WORKER_ID), int(time.time()), ex=VISIBILITY_TIMEOUT)
+        self.redis_client.sadd(WORKERS_KEY, WORKER_ID)
+        recovered = self.requeue_processing(WORKER_ID)
+        if recovered:
+            logger.warning(f'♻️  Re-queued {recovered} unfinished jobs from the previous run')
+        threading.Thread(target=self.heartbeat, daemon=True).start()
+        self.fetch_published_cookie()
+        threading.Thread(target=self.watch_cookie, daemon=True).start()
+        
         # Reload cookie periodically
         logger.info('📋 Worker ready. Waiting for jobs...')
         
         while True:
             try:
-                # Blocking pop from queue (timeout 5 seconds)
-                result = self.redis_client.blpop(QUEUE_NAME, timeout=5)
+                self.apply_cookie_update()
+                if not self.breaker_allows():
+                    # Circuit open - leave jobs queued and wait for a new cookie
+                    self.reload_cookie()
+                    if time.time() - self.last_reap >= VISIBILITY_TIMEOUT:
+                        self.reap_abandoned()
+                        self.report_lane_depths()
+                    time.sleep(1)
+                    continue
                 
-                if result:
-                    queue_name, job_json = result
-                    job_data = json.loads(job_json)
-                    self.process_job(job_data)
-                else:
-                    # Timeout - check if cookie needs refresh
-                    # Reload cookie from .env in case it was updated
-                    load_dotenv(override=True)
-                    new_cookie = os.getenv('IEEE_COOKIE', '')
-                    if new_cookie and new_cookie != self.current_cookie:
-                        logger.info('🔄 Cookie updated, reloading session...')
-                        self.current_cookie = new_cookie
-                        self.setup_session()
+                # Blocking pop of up to BATCH_SIZE jobs (timeout 5 seconds);
+                # a half-open breaker takes a single probe job
+                jobs = self.fetch_jobs(1 if self.breaker == 'half_open' else BATCH_SIZE)
+                
+                if jobs:
+                    self.process_batch(jobs)
+                    # Unfinished jobs (session expired, failed writes) go back to the queue
+                    self.release_in_flight()
+                
+                if time.time() - self.last_reap >= VISIBILITY_TIMEOUT:
+                    self.reap_abandoned()
+                    self.report_lane_depths()
+                
+                if not jobs:
+                    # Timeout - reload cookie from .env in case it was updated
+                    self.reload_cookie()
                 
             except redis.exceptions.ConnectionError:
                 logger.error('❌ Redis connection lost. Reconnecting...')
@@ -378,11 +834,17 @@ class IEEEWorker:
                 if not self.connect_redis():
                     logger.error('❌ Reconnection failed. Exiting...')
                     sys.exit(1)
+                self.release_in_flight()
             except KeyboardInterrupt:
                 logger.info('🛑 Worker stopped by user')
+                self.release_in_flight()
                 break
             except Exception as e:
                 logger.error(f'❌ Unexpected error: {e}')
+                try:
+                    self.release_in_flight()
+                except Exception as release_error:
+                    logger.error(f'Failed to re-queue jobs: {release_error}')
                 time.sleep(1)
 
 